@@ -1,8 +1,107 @@
 import json
+import csv
+import gzip
+import bz2
+import lzma
 import typing
 import statistics
 import os
+import pickle
+import shutil
 import datetime
+import io
+import itertools
+import asyncio
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .storage import RowStore, ColumnStore
+from .index import HashIndex, SortedIndex
+from . import stats
+from .lazy import LazyComma, COMPARISONS, cell_test
+from .groupby import GroupBy
+from . import join
+from . import sketches
+from . import snapshots
+from . import engines
+
+# prepare(categorical="auto") encodes text columns with at most this share
+# of distinct values
+_CATEGORICAL_MAX_SHARE = 0.5
+
+# column widths of a larger display window are measured on a sample of rows
+_WIDTH_SAMPLE = 1000
+
+_COMPRESSED_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open
+}
+
+def _open_output(file_path):
+    # compression is picked from the file extension
+    extension = os.path.splitext(str(file_path))[1].lower()
+    if extension in _COMPRESSED_OPENERS:
+        opener = _COMPRESSED_OPENERS[extension]
+        return opener(file_path, mode="wt", encoding="utf-8", newline="")
+
+    return open(
+        file_path, 
+        mode="w", 
+        encoding="utf-8", 
+        newline="", 
+        buffering=1 << 20
+    )
+
+def _batched(rows, size):
+    rows = iter(rows)
+    batch = list(itertools.islice(rows, size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(rows, size))
+
+def _peeked(chunks):
+    # a lazy source only knows its header once the first chunk is read
+    chunks = iter(chunks)
+    return itertools.chain([next(chunks, [])], chunks)
+
+# the two functions below run in worker processes, so they must stay
+# module-level functions
+def _parse_byte_range(filepath, start, end, delimiter, plan, engine):
+    with open(filepath, mode="rb") as csv_file:
+        csv_file.seek(start)
+        block = csv_file.read(end - start)
+
+    # decode the same way a text-mode file would, newline handling included
+    text = io.TextIOWrapper(io.BytesIO(block), encoding="utf-8").read()
+    parser = engines.create(engine, delimiter)
+    rows = parser.parse_range(text, plan)
+    return rows, parser.stats()
+
+def _describe_columns(columns, quantiles) -> list:
+    return [stats.summarize(values, quantiles) for values in columns]
+
+def _numpy_summary(array, quantiles) -> dict:
+    # NumPy releases the GIL in these reductions, so threads can overlap
+    summary = {
+        "count": int(array.size),
+        "mean": float(array.mean()),
+        "stdev": float(array.std(ddof=1)) if array.size > 1 else None,
+        "minimum": float(array.min()),
+        "median": float(numpy.median(array)),
+        "maximum": float(array.max()),
+        "quantiles": []
+    }
+    if quantiles:
+        summary["quantiles"] = numpy.quantile(array, quantiles).tolist()
+
+    return summary
+
 
 class Comma:
     def __init__(
@@ -10,6 +109,8 @@ class Comma:
         filepath, 
         includes_header=True, 
         delimiter=",", 
+        storage="rows",
+        engine="fast"
     ):
         self.__filepath = filepath
 
@@ -20,123 +121,141 @@ class Comma:
 
         self.__delimiter = delimiter
 
+        if storage not in ("rows", "columnar"):
+            raise ValueError("Argument storage must be 'rows' or 'columnar'")
+        self.__storage = storage
+        self.__block_size = 65536
+        self.__engine = engines.create(engine, delimiter)
+
         self.__csv_file = None
-        self.__data = []
         self.__header = []
+        self.__data = self._new_store()
         self.__prepared = False
-        self.__json = {}
         self.__primary_column_name = None
+        self.__primary_index = None
+        self.__indexes = {}
+        self.__rows_version = 0
+        self.__column_versions = {}
+        self.__column_cache = {}
+        self.__tracked = {}
+        self.__source = None
+        self.__source_state = None
+        self.__sampled = None
         self.__configs = {
             "success_messages": True,
-            "max_row_display": 5
+            "max_row_display": 5,
+            "use_numpy": numpy is not None
         }
 
         self.__internal_configs = {
             "row_display_start": -1,
-            "row_display_end": -1
+            "row_display_end": -1,
+            "page": 0
         }
+        self.__terminal_columns = None
         
         # self.__history WIP
 
-    def __repr__(self):
-        if not self.__prepared:
-            raise Exception("Must call comma.prepare() first")\
+    def _terminal_columns(self) -> int:
+        # measured once, shutil falls back to 80 columns outside a terminal
+        if self.__terminal_columns is None:
+            self.__terminal_columns = shutil.get_terminal_size().columns
+        return self.__terminal_columns
 
-        rows = self.__data[:self.__configs["max_row_display"]]
+    def _display_window(self) -> tuple:
+        # a show() window takes precedence over the current page
+        page_size = max(self.__configs["max_row_display"], 0)
+        start = self.__internal_configs["row_display_start"]
+        end = self.__internal_configs["row_display_end"]
 
-        if self.__internal_configs["row_display_start"] != -1 and \
-            self.__internal_configs["row_display_end"] != -1:
-            start = self.__internal_configs["row_display_start"]
-            end = self.__internal_configs["row_display_end"]
+        if start == -1:
+            start = self.__internal_configs["page"] * page_size
+            return start, start + page_size
+        if end == -1:
+            return start, start + page_size
 
-            rows = self.__data[start:end+1]
+        return start, end + 1
 
-        longest_values = {}
+    def __repr__(self):
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
 
-        for column_name in self.__header:
-            longest_values[column_name] = len(column_name)
+        start, end = self._display_window()
+        self._set_internal_config("row_display_start", -1)
+        self._set_internal_config("row_display_end", -1)
 
-        for i in range(len(rows)):
-            for j in range(len(rows[i])):
-                if self.__header[j] not in longest_values:
-                    longest_values[self.__header[j]] = len(rows[i][j])
-                else:
-                    if longest_values[self.__header[j]] < len(rows[i][j]):
-                        longest_values[self.__header[j]] = len(rows[i][j])
+        rows = self.__data[start:end]
+
+        # widths come from the visible rows only, or from an even sample of
+        # them when the window is very large
+        measured = rows
+        if len(rows) > _WIDTH_SAMPLE:
+            step = len(rows) / _WIDTH_SAMPLE
+            measured = [rows[int(i * step)] for i in range(_WIDTH_SAMPLE)]
+
+        widths = [len(column_name) for column_name in self.__header]
+        for row in measured:
+            for j in range(min(len(row), len(widths))):
+                if widths[j] < len(row[j]):
+                    widths[j] = len(row[j])
 
         # length of placeholder must be same as length of overflow_sign
-        output = ""
         placeholder = "  "
-        terminal_column_size = os.get_terminal_size().columns
+        terminal_column_size = self._terminal_columns()
         overflow_sign = "->"
 
-        for key in list(longest_values.keys()):
-            diff = len(key) - longest_values[key]
-
-            if diff < 0:
-                column = key + (" " * abs(diff))
-
-                reserved = len(output) + len(column) + len(placeholder)
-                if reserved <= terminal_column_size:
-                    output += column
-                else:
-                    output += overflow_sign
-                    break
-
-            elif diff >= 0:
-                reserved = len(output) + len(key) + len(placeholder)
-                if reserved <= terminal_column_size:
-                    output += key
-                else:
-                    output += overflow_sign
-                    break
+        visible = 0
+        reserved = 0
+        for width in widths:
+            reserved += width + len(placeholder)
+            if reserved > terminal_column_size:
+                break
+            visible += 1
 
-            output += placeholder
+        lines = []
+        for values in itertools.chain([self.__header], rows):
+            cells = []
+            for j in range(min(visible, len(values))):
+                # values missed by the width sample are cut to fit
+                cells.append(values[j][:widths[j]].ljust(widths[j]))
+                cells.append(placeholder)
+            if visible < len(widths):
+                cells.append(overflow_sign)
+            lines.append("".join(cells))
 
-        output += "\n"
-        
-        longest_values_keys = list(longest_values.keys())
-        for i in range(len(rows)):
-            row = rows[i]
-            row_string = ""
-
-            for j in range(len(row)):
-                key = longest_values_keys[j]
-                diff = len(row[j]) - longest_values[key]
-
-                if diff < 0:
-                    column = row[j] + (" " * abs(diff))
-
-                    reserved = len(row_string)+len(column)+len(placeholder)
-                    if reserved <= terminal_column_size:
-                        row_string += column
-                        row_string += placeholder
-                    else:
-                        row_string += overflow_sign
-                        break
-                        
-                elif diff >= 0:
-                    reserved = len(row_string) + len(key) + len(placeholder)
-                    if reserved <= terminal_column_size:
-                        row_string += row[j]
-                        row_string += placeholder
-                    else:
-                        row_string += overflow_sign
-                        break
-            
-            row_string += "\n"
-            output += row_string
-            
-            self._set_internal_config("row_display_start", -1)
-            self._set_internal_config("row_display_end", -1)
+        if self.__sampled is not None:
+            lines.append(self._sample_note())
 
-        return output
+        return "\n".join(lines) + "\n"
 
     def show(self, row_start=-1, row_end=-1):
+        # rows row_start to row_end inclusive on the next render only,
+        # a page of rows when row_end is left out
         self._set_internal_config("row_display_start", row_start)
         self._set_internal_config("row_display_end", row_end)
         return self
 
+    def page(self, n):
+        # pages are max_row_display rows long and counted from 0
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        if not isinstance(n, int) or n < 0:
+            raise ValueError("Argument n must be a non-negative integer")
+
+        page_size = max(self.__configs["max_row_display"], 1)
+        page_count = max(1, -(-len(self.__data) // page_size))
+        if n >= page_count:
+            msg = "Page " + str(n) + " does not exist, there are "
+            msg += str(page_count) + " pages"
+            raise ValueError(msg)
+
+        self._set_internal_config("page", n)
+        return self
+
+    def next_page(self):
+        return self.page(self.__internal_configs["page"] + 1)
+
     def _set_internal_config(self, config, value):
         if not isinstance(config, str):
             raise ValueError("Argument config must be a string")
@@ -152,6 +271,11 @@ class Comma:
                     raise ValueError("Config must be of int type")
                 else:
                     self.__internal_configs[config] = value
+            elif config == "page":
+                if not isinstance(value, int):
+                    raise ValueError("Config must be of int type")
+                else:
+                    self.__internal_configs[config] = value
         else:
             raise ValueError("Invalid configuration " + str(config))
 
@@ -178,12 +302,27 @@ class Comma:
                     raise ValueError("Config must be of int type")
                 else:
                     self.__configs[config] = value
+            elif config == "use_numpy":
+                if not isinstance(value, bool):
+                    raise ValueError("Config must be of bool type")
+                elif value and numpy is None:
+                    raise ValueError("NumPy is not installed")
+                else:
+                    self.__configs[config] = value
         else:
             raise ValueError("Invalid configuration " + str(config))
 
     def get_data(self) -> list:
         return self.__data
 
+    def get_storage(self) -> str:
+        return self.__storage
+
+    def _new_store(self, rows=None):
+        if self.__storage == "columnar":
+            return ColumnStore.from_rows(rows or [], len(self.__header))
+        return RowStore(rows or [])
+
     def get_header(self) -> list:
         return self.__header
 
@@ -213,16 +352,265 @@ class Comma:
         if str(column_name) not in self.__header:
             raise ValueError("Column " + str(column_name) + " does not exist")
             
-        num_of_rows = self.dimension()["rows"]
+        column_idx = self.__header.index(str(column_name))
+        index = HashIndex(self.__data.column(column_idx))
+
         if not ignore_duplicates:
-            if len(self.unique_values(str(column_name))) == num_of_rows:   
+            if not index.has_duplicates():
                 self.__primary_column_name = str(column_name)
+                self.__primary_index = index
             else:
                 msg = "Duplicate values detected. "
                 msg = "Primary column cannot have duplicate values"
                 raise Exception(msg)
         else:
             self.__primary_column_name = str(column_name)
+            self.__primary_index = index
+
+    def _get_primary_index(self) -> HashIndex:
+        self.__primary_index = self._rebuilt(
+            self.__primary_index,
+            self.__primary_column_name,
+            HashIndex
+        )
+        return self.__primary_index
+
+    def _rebuilt(self, current, column_name, build):
+        # _data_changed() sets indexes and tracked stats to None, and they
+        # are rebuilt from the column values the next time they are used
+        if current is None:
+            column_idx = self.__header.index(column_name)
+            current = build(self.__data.column(column_idx))
+
+        return current
+
+    def _data_changed(self, column_idx=None, tracked=False):
+        # column_idx=None means rows were removed or reordered,
+        # tracked=True means the caller already updated the tracked stats
+        changed = None
+        if column_idx is not None:
+            changed = self.__header[column_idx]
+            versions = self.__column_versions
+            versions[changed] = versions.get(changed, 0) + 1
+        else:
+            self.__rows_version += 1
+
+        if self.__primary_column_name is not None:
+            if changed is None or changed == self.__primary_column_name:
+                self.__primary_index = None
+
+        for column_name, entry in self.__indexes.items():
+            if changed is None or changed == column_name:
+                entry["index"] = None
+
+        if not tracked:
+            for column_name in self.__tracked:
+                if changed is None or changed == column_name:
+                    self.__tracked[column_name] = None
+
+    def _rows_added(self, rows, first_row_idx):
+        self.__rows_version += 1
+
+        if self.__primary_index is not None:
+            primary_column_idx = self.__header.index(self.__primary_column_name)
+            for offset, row in enumerate(rows):
+                self.__primary_index.add(
+                    str(row[primary_column_idx]), 
+                    first_row_idx + offset
+                )
+
+        for column_name, entry in self.__indexes.items():
+            if entry["index"] is None:
+                continue
+
+            column_idx = self.__header.index(column_name)
+            for offset, row in enumerate(rows):
+                value = str(row[column_idx])
+                if entry["index"].add(value, first_row_idx + offset) is False:
+                    entry["index"] = None
+                    break
+
+        for column_name, tracked in self.__tracked.items():
+            if tracked is not None:
+                column_idx = self.__header.index(column_name)
+                tracked.extend(row[column_idx] for row in rows)
+
+    def _rows_removed(self, rows):
+        for column_name, tracked in self.__tracked.items():
+            if tracked is not None:
+                column_idx = self.__header.index(column_name)
+                for row in rows:
+                    tracked.remove(row[column_idx])
+
+        self._data_changed(tracked=True)
+
+    def create_index(self, column_name, kind="hash"):
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        try: 
+            column_idx = self.__header.index(str(column_name))
+        except ValueError:
+            raise ValueError("Column " + str(column_name) + " does not exist")
+
+        if kind not in ("hash", "sorted"):
+            raise ValueError("Argument kind must be 'hash' or 'sorted'")
+
+        self.__indexes[str(column_name)] = {"kind": kind, "index": None}
+        self._get_index(column_name)
+
+        if self.__configs["success_messages"]:
+            print("Index created on column " + str(column_name))
+
+    def drop_index(self, column_name):
+        if str(column_name) not in self.__indexes:
+            raise ValueError("No index on column " + str(column_name))
+
+        del self.__indexes[str(column_name)]
+
+    def get_indexes(self) -> dict:
+        return {name: entry["kind"] for name, entry in self.__indexes.items()}
+
+    def _get_index(self, column_name):
+        entry = self.__indexes.get(str(column_name))
+        if entry is None:
+            return None
+
+        build = HashIndex if entry["kind"] == "hash" else SortedIndex
+        entry["index"] = self._rebuilt(entry["index"], str(column_name), build)
+        return entry["index"]
+
+    def _get_sorted_index(self, column_name) -> SortedIndex:
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        index = self._get_index(column_name)
+        if not isinstance(index, SortedIndex):
+            msg = "No sorted index on column " + str(column_name) + ". "
+            msg += "Use create_index(column_name, kind='sorted')"
+            raise Exception(msg)
+
+        return index
+
+    def track_stats(self, column_name):
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        try: 
+            column_idx = self.__header.index(str(column_name))
+        except ValueError:
+            raise ValueError("Column " + str(column_name) + " does not exist")
+
+        values = self.__data.column(column_idx)
+        self.__tracked[str(column_name)] = stats.TrackedStats(values)
+
+        if self.__configs["success_messages"]:
+            print("Tracking stats of column " + str(column_name))
+
+    def untrack_stats(self, column_name):
+        if str(column_name) not in self.__tracked:
+            raise ValueError("Column " + str(column_name) + " is not tracked")
+
+        del self.__tracked[str(column_name)]
+
+    def get_tracked_stats(self) -> list:
+        return list(self.__tracked)
+
+    def _tracked_stats(self, column_idx, ignore_na=False):
+        # None means the column is not tracked, or that the usual path has
+        # to run to raise its error about values that are not numbers
+        column_name = self.__header[column_idx]
+        if column_name not in self.__tracked:
+            return None
+
+        tracked = self._rebuilt(
+            self.__tracked[column_name],
+            column_name,
+            stats.TrackedStats
+        )
+        self.__tracked[column_name] = tracked
+        if tracked.na_count and not ignore_na:
+            return None
+
+        return tracked
+
+    def find_by(self, column_name, value) -> list[int]:
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        try: 
+            column_idx = self.__header.index(str(column_name))
+        except ValueError:
+            raise ValueError("Column " + str(column_name) + " does not exist")
+
+        index = self._get_index(column_name)
+        if index is not None:
+            return index.lookup(str(value))
+
+        categories = self.__data.categories(column_idx)
+        if categories is not None:
+            if str(value) not in categories:
+                return []
+            code = categories.index(str(value))
+            codes = self.__data.category_codes(column_idx)
+            return [i for i in range(len(codes)) if codes[i] == code]
+
+        values = self.__data.column(column_idx)
+        return [i for i in range(len(values)) if values[i] == str(value)]
+
+    def filter_rows(self, column_name, op, value) -> list[int]:
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        try: 
+            column_idx = self.__header.index(str(column_name))
+        except ValueError:
+            raise ValueError("Column " + str(column_name) + " does not exist")
+
+        if op not in COMPARISONS:
+            msg = "Argument op must be one of " + ", ".join(COMPARISONS)
+            raise ValueError(msg)
+
+        compare = COMPARISONS[op]
+
+        # a numeric value compares numerically, everything else as text
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            value = str(value)
+
+            # categorical columns compare each distinct value only once
+            categories = self.__data.categories(column_idx)
+            if categories is not None:
+                matched = {
+                    code for code in range(len(categories)) 
+                    if compare(categories[code], value)
+                }
+                codes = self.__data.category_codes(column_idx)
+                return [i for i in range(len(codes)) if codes[i] in matched]
+
+            values = self.__data.column(column_idx)
+            return [i for i in range(len(values)) if compare(values[i], value)]
+
+        try:
+            keys = self._float_values(column_idx)
+        except ValueError:
+            # cells that are not numbers fail the test
+            test = cell_test(op, number)
+            values = self.__data.column(column_idx)
+            return [i for i in range(len(values)) if test(values[i])]
+
+        array = self._float_array(column_idx)
+        if array is not None:
+            return numpy.flatnonzero(compare(array, number)).tolist()
+
+        return [i for i in range(len(keys)) if compare(keys[i], number)]
+
+    def rows_between(self, column_name, lo=None, hi=None) -> list[int]:
+        return self._get_sorted_index(column_name).between(lo, hi)
+
+    def rows_with_prefix(self, column_name, prefix) -> list[int]:
+        return self._get_sorted_index(column_name).prefix(prefix)
 
     def _get_prepared(self) -> bool:
         return self.__prepared
@@ -244,100 +632,864 @@ class Comma:
     def dimension(self) -> dict:
         return {"columns": len(self.__header), "rows": len(self.__data)}
 
-    def prepare(self):
+    def prepare(
+        self, 
+        workers=None, 
+        categorical=None, 
+        snapshot=None, 
+        usecols=None, 
+        where=None,
+        sample=None,
+        seed=None,
+        head=None
+    ):
         start_time = datetime.datetime.now()
+
+        if workers is not None:
+            if not isinstance(workers, int) or workers < 1:
+                raise ValueError("Argument workers must be a positive integer")
+
+        for name, value in (("sample", sample), ("head", head)):
+            if value is not None and (not isinstance(value, int) or value < 1):
+                msg = "Argument " + name + " must be a positive integer"
+                raise ValueError(msg)
+
+        if sample is not None and head is not None:
+            raise ValueError("Arguments sample and head cannot be combined")
+
+        if (sample is not None or head is not None) and \
+            workers is not None and workers > 1:
+            msg = "Arguments sample and head cannot be used with workers"
+            raise ValueError(msg)
+
+        if categorical is not None:
+            if self.__storage != "columnar":
+                msg = "Categorical columns require storage='columnar'"
+                raise Exception(msg)
+            if categorical != "auto" and not isinstance(categorical, list):
+                msg = "Argument categorical must be 'auto' or a list"
+                raise ValueError(msg)
     
-        if not self.__prepared:
+        if self.__prepared:
+            raise Exception("Redundant preparation call detected")
+
+        # a projected, filtered or sampled parse is not a copy of the source
+        source = None
+        if usecols is None and where is None and \
+            sample is None and head is None:
+            source = self._source_stamp()
+
+        if snapshot is not None and self._reuse_snapshot(snapshot, source):
+            if self.__configs["success_messages"]:
+                print("Preparation complete (from snapshot)")
+        else:
             with open(self.__filepath, mode="r", encoding="utf-8") as csv_file:
-                if self.__includes_header:
-                    header_line = csv_file.readline()
-                    header = header_line.split(self.__delimiter)
-                    header[-1] = header[-1].replace("\n", "")
-                    self.__header = header
+                self.__csv_file = csv_file
+                header = self._read_header(csv_file)
+                plan, self.__header = self._parse_plan(header, usecols, where)
+                self.__data = self._new_store()
+
+                if workers is None or workers == 1:
+                    blocks = self._read_chunks(
+                        csv_file, 
+                        self.__block_size, 
+                        plan
+                    )
                 else:
-                    if len(self.__header) == 0 or self.__header is None:
-                        msg = "No header detected. "
-                        msg += "Please manually set a header before prepare call."
-                        raise Exception(msg)
+                    blocks = self._read_parallel(
+                        csv_file.tell(), 
+                        workers, 
+                        plan
+                    )
 
-                self.__data = []
-                line = csv_file.readline()
+                if head is not None:
+                    blocks = self._head(blocks, head)
+                elif sample is not None:
+                    blocks = self._sample(blocks, sample, seed)
 
-                while line:
-                    line = line.split(self.__delimiter)
-                    line[-1] = line[-1].replace("\n", "")
-                    self.__data.append(line)
-                    line = csv_file.readline()
+                # columnar storage is filled in blocks to bound peak memory
+                for rows in blocks:
+                    self.__data.extend(rows)
 
                 self.__prepared = True
+
+                if categorical == "auto":
+                    for column_idx in range(len(self.__header)):
+                        if self.__data.low_cardinality(
+                            column_idx, 
+                            _CATEGORICAL_MAX_SHARE
+                        ):
+                            self.__data.encode_categorical(column_idx)
+                elif categorical is not None:
+                    for column_name in categorical:
+                        self.encode_categorical(column_name)
+
+            self.__source = source
+            self.__source_state = self._state()
+
+            # a projected, filtered or sampled parse must not replace a
+            # snapshot of the whole file
+            if snapshot is not None and source is not None:
+                self.save_snapshot(snapshot)
                 
-                if self.__configs["success_messages"]:
-                    print("Preparation complete")
-        else:
-            raise Exception("Redundant preparation call detected")
+            if self.__configs["success_messages"]:
+                print("Preparation complete")
 
         end_time = datetime.datetime.now()
-        print("Time elapsed: " + str(end_time - start_time))
+        if self.__configs["success_messages"]:
+            print("Time elapsed: " + str(end_time - start_time))
+
+    async def aprepare(self, executor=None, **kwargs):
+        # runs prepare() in executor, the loop's default one when None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            executor, 
+            functools.partial(self.prepare, **kwargs)
+        )
+
+    @classmethod
+    async def aload_many(
+        cls, 
+        paths, 
+        concurrency=4, 
+        return_exceptions=False, 
+        prepare_options=None, 
+        **options
+    ):
+        # yields (path, prepared Comma) pairs as they complete, options go
+        # to the constructor and prepare_options to prepare()
+        if not isinstance(concurrency, int) or concurrency < 1:
+            msg = "Argument concurrency must be a positive integer"
+            raise ValueError(msg)
+
+        prepare_options = prepare_options or {}
+
+        def load(path):
+            comma = cls(path, **options)
+            comma.set_config("success_messages", False)
+            comma.prepare(**prepare_options)
+            return path, comma
+
+        async def run(path, future):
+            try:
+                return await future
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                return path, error
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        tasks = [
+            asyncio.ensure_future(
+                run(path, loop.run_in_executor(executor, load, path))
+            )
+            for path in paths
+        ]
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _head(self, blocks, rows):
+        # stops reading the file as soon as enough rows were parsed
+        # the table only counts as sampled when rows were left unread
+        kept = 0
+        for chunk in blocks:
+            cut = len(chunk) > rows - kept
+            chunk = chunk[:rows - kept]
+            kept += len(chunk)
+            yield chunk
+            if kept == rows:
+                if cut or any(len(rest) for rest in blocks):
+                    self.__sampled = {"method": "head", "rows": kept}
+                break
+
+    def _sample(self, blocks, rows, seed):
+        reservoir = stats.Reservoir(rows, seed)
+        for chunk in blocks:
+            reservoir.extend(chunk)
+
+        sampled = reservoir.items()
+        if reservoir.seen > rows:
+            self.__sampled = {
+                "method": "sample", 
+                "rows": len(sampled), 
+                "rows_read": reservoir.seen
+            }
+        yield sampled
+
+    def is_sampled(self) -> bool:
+        return self.__sampled is not None
+
+    def get_sample_info(self) -> dict:
+        if self.__sampled is None:
+            return None
+        return dict(self.__sampled)
+
+    def _sample_note(self) -> str:
+        info = self.__sampled
+        if info["method"] == "head":
+            note = "First " + str(info["rows"]) + " rows"
+        else:
+            note = "Random sample of " + str(info["rows"]) + " rows out of "
+            note += str(info["rows_read"])
+        return note + ", results are estimates"
+
+    def _source_stamp(self):
+        # identifies the exact csv file a prepare() call parses
+        try:
+            stat = os.stat(self.__filepath)
+        except (OSError, TypeError):
+            return None
+
+        return {
+            "path": os.path.abspath(self.__filepath),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "delimiter": self.__delimiter,
+            "includes_header": self.__includes_header,
+            "engine": self.__engine.name
+        }
+
+    def _state(self) -> tuple:
+        return (
+            self.__rows_version,
+            sorted(self.__column_versions.items()),
+            list(self.__header)
+        )
+
+    def _reuse_snapshot(self, path, source) -> bool:
+        if source is None or not os.path.exists(path):
+            return False
+
+        try:
+            footer = snapshots.read_footer(path)
+        except ValueError:
+            return False
+
+        if footer["source"] != source:
+            return False
+
+        footer, header, store = snapshots.read(path)
+        if self.__storage == "rows":
+            store = RowStore(list(store))
+
+        self.__header = header
+        self.__data = store
+        self.__prepared = True
+        self.__source = source
+        self.__source_state = self._state()
+        return True
+
+    def save_snapshot(self, file_path):
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        # the source is only recorded while the data is an untouched parse
+        # of it, so that prepare() can safely reuse the snapshot
+        source = None
+        if self.__source is not None and \
+            self.__source_state == self._state():
+            source = self.__source
+
+        snapshots.write(file_path, self.__header, self.__data, source)
+
+        if self.__configs["success_messages"]:
+            print("Snapshot saved to " + str(file_path))
+
+    @classmethod
+    def open_snapshot(cls, file_path, columns=None):
+        if columns is not None:
+            if not isinstance(columns, list):
+                raise ValueError("Argument columns must be a list")
+            columns = [str(c) for c in columns]
+
+        footer, header, store = snapshots.read(file_path, columns)
+        source = footer["source"] or {}
+
+        comma = cls(
+            source.get("path", file_path),
+            includes_header=source.get("includes_header", True),
+            delimiter=source.get("delimiter", ","),
+            storage="columnar",
+            engine=source.get("engine", "fast")
+        )
+        comma.__header = header
+        comma.__data = store
+        comma.__prepared = True
+        return comma
+
+    def _read_header(self, csv_file) -> list:
+        if self.__includes_header:
+            return self.__engine.parse_header(csv_file.readline())
+
+        if len(self.__header) == 0 or self.__header is None:
+            msg = "No header detected. "
+            msg += "Please manually set a header before prepare call."
+            raise Exception(msg)
+
+        return self.__header
+
+    def get_engine(self) -> str:
+        return self.__engine.name
+
+    def get_engine_stats(self) -> dict:
+        return self.__engine.stats()
+
+    def _parse_plan(self, header, usecols, where) -> tuple:
+        # returns (plan, header of the kept columns), plan None means
+        # every row is kept whole
+        if usecols is None and where is None:
+            return None, header
+
+        def position(column_name):
+            try:
+                return header.index(str(column_name))
+            except ValueError:
+                msg = "Column " + str(column_name) + " does not exist"
+                raise ValueError(msg)
+
+        if usecols is None:
+            positions = list(range(len(header)))
+        elif isinstance(usecols, list):
+            positions = [position(c) for c in usecols]
+        else:
+            raise ValueError("Argument usecols must be a list")
+
+        tests = []
+        row_test = None
+        if callable(where):
+            row_test = where
+        elif isinstance(where, dict):
+            # a callable tests the cell, anything else lists allowed values
+            for column_name, wanted in where.items():
+                if callable(wanted):
+                    fn = wanted
+                elif isinstance(wanted, (list, tuple, set, frozenset)):
+                    fn = frozenset(str(v) for v in wanted).__contains__
+                else:
+                    fn = frozenset([str(wanted)]).__contains__
+                tests.append((position(column_name), fn))
+        elif where is not None:
+            raise ValueError("Argument where must be a dict or a callable")
+
+        last = max(positions + [i for i, fn in tests], default=0)
+        plan = (last, positions, tests, row_test, list(header))
+        return plan, [header[i] for i in positions]
+
+    def _byte_ranges(self, start, parts) -> list:
+        ranges = []
+        with open(self.__filepath, mode="rb") as csv_file:
+            end = csv_file.seek(0, os.SEEK_END)
+            step = max((end - start) // parts, 1)
+            boundary = start
+
+            while boundary < end:
+                # move each split point forward to the start of the next line
+                csv_file.seek(min(boundary + step, end))
+                csv_file.readline()
+                next_boundary = min(csv_file.tell(), end)
+                ranges.append((boundary, next_boundary))
+                boundary = next_boundary
+
+        return ranges
+
+    def _read_parallel(self, start, workers, plan=None):
+        ranges = self._byte_ranges(start, workers * 4)
+        starts = [r[0] for r in ranges]
+        ends = [r[1] for r in ranges]
+
+        # where predicates that cannot be sent to a worker process (lambdas,
+        # local functions) are applied here to the parsed rows instead
+        worker_plan = plan
+        if plan is not None:
+            try:
+                pickle.dumps(plan)
+            except (pickle.PicklingError, AttributeError, TypeError):
+                worker_plan = None
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _parse_byte_range,
+                itertools.repeat(self.__filepath),
+                starts,
+                ends,
+                itertools.repeat(self.__delimiter),
+                itertools.repeat(worker_plan),
+                itertools.repeat(self.__engine.name)
+            )
+
+            for rows, parse_stats in results:
+                self.__engine.merge_stats(parse_stats)
+                if worker_plan is not plan:
+                    rows = engines.select_rows(rows, plan)
+                yield rows
+
+    def _read_chunks(self, csv_file, rows, plan=None):
+        return self.__engine.read(csv_file, rows, plan)
+
+    def iter_chunks(self, rows=100_000):
+        if not isinstance(rows, int) or rows < 1:
+            raise ValueError("Argument rows must be a positive integer")
+
+        with open(self.__filepath, mode="r", encoding="utf-8") as csv_file:
+            self.__csv_file = csv_file
+            header = self._read_header(csv_file)
+
+            # the in-memory header wins once the data has been prepared
+            if not self.__prepared:
+                self.__header = header
+
+            yield from self._read_chunks(csv_file, rows)
+
+    def _stream_column(self, column_name, rows):
+        column_idx = self._file_column_idx(column_name)
+        for chunk in self.iter_chunks(rows=rows):
+            yield [row[column_idx] for row in chunk]
+
+    def _file_column_idx(self, column_name) -> int:
+        with open(self.__filepath, mode="r", encoding="utf-8") as csv_file:
+            header = self._read_header(csv_file)
+
+        try: 
+            return header.index(str(column_name))
+        except ValueError:
+            raise ValueError("Column " + str(column_name) + " does not exist")
+
+    def _stream_floats(self, column_name, ignore_na, rows):
+        offset = 0
+        for values in self._stream_column(column_name, rows):
+            yield self._parse_floats(values, ignore_na, offset)
+            offset += len(values)
+
+    def stream_sum(self, column_name, ignore_na=False, rows=100_000) -> float:
+        result = 0
+        for numbers in self._stream_floats(column_name, ignore_na, rows):
+            result += sum(numbers)
+
+        return result
+
+    def stream_mean(self, column_name, ignore_na=False, rows=100_000) -> float:
+        total = 0
+        count = 0
+        for numbers in self._stream_floats(column_name, ignore_na, rows):
+            total += sum(numbers)
+            count += len(numbers)
+
+        if count == 0:
+            raise statistics.StatisticsError(
+                "mean requires at least one data point"
+            )
+
+        return total / count
+
+    def stream_minimum(self, column_name, rows=100_000):
+        result = None
+        for numbers in self._stream_floats(column_name, True, rows):
+            if numbers:
+                chunk_min = min(numbers)
+                if result is None or chunk_min < result:
+                    result = chunk_min
+
+        if result is None:
+            raise ValueError("Column " + str(column_name) + " has no values")
+
+        return result
+
+    def stream_maximum(self, column_name, rows=100_000):
+        result = None
+        for numbers in self._stream_floats(column_name, True, rows):
+            if numbers:
+                chunk_max = max(numbers)
+                if result is None or chunk_max > result:
+                    result = chunk_max
+
+        if result is None:
+            raise ValueError("Column " + str(column_name) + " has no values")
+
+        return result
+
+    def stream_value_counts(self, column_name, rows=100_000) -> dict:
+        counts = {}
+        for values in self._stream_column(column_name, rows):
+            for value in values:
+                if value not in counts:
+                    counts[value] = 1
+                else:
+                    counts[value] += 1
+
+        return counts
+
+    def _scan_column(self, column_name, rows):
+        header, chunks = self._scan(rows)
+
+        try:
+            column_idx = header.index(str(column_name))
+        except ValueError:
+            if hasattr(chunks, "close"):
+                chunks.close()
+            raise ValueError("Column " + str(column_name) + " does not exist")
+
+        for chunk in chunks:
+            yield [row[column_idx] for row in chunk]
+
+    def approx_unique_sketch(
+        self,
+        column_name,
+        precision=14,
+        rows=100_000
+    ) -> sketches.HyperLogLog:
+        sketch = sketches.HyperLogLog(precision)
+        for values in self._scan_column(column_name, rows):
+            sketch.update(values)
+
+        return sketch
+
+    def approx_unique(self, column_name, precision=14, rows=100_000) -> dict:
+        sketch = self.approx_unique_sketch(column_name, precision, rows)
+
+        return {
+            "estimate": sketch.count(),
+            "relative_error": sketch.relative_error()
+        }
+
+    def approx_quantile_sketch(
+        self,
+        column_name,
+        k=200,
+        rows=100_000,
+        seed=None
+    ) -> sketches.KLLSketch:
+        # values that are not numbers are skipped
+        sketch = sketches.KLLSketch(k, seed)
+        for values in self._scan_column(column_name, rows):
+            sketch.update(self._parse_floats(values, ignore_na=True))
+
+        return sketch
+
+    def approx_quantile(
+        self,
+        column_name,
+        q,
+        k=200,
+        rows=100_000,
+        seed=None
+    ) -> dict:
+        sketch = self.approx_quantile_sketch(column_name, k, rows, seed)
+        if sketch.count == 0:
+            raise ValueError("Column " + str(column_name) + " has no values")
+
+        if isinstance(q, list):
+            estimate = [sketch.quantile(x) for x in q]
+        else:
+            estimate = sketch.quantile(q)
+
+        return {
+            "estimate": estimate,
+            "rank_error": sketch.rank_error(),
+            "count": sketch.count
+        }
+
+    def _scan(self, rows=100_000):
+        # header plus row batches, from memory when prepared, else from file
+        if self.__prepared:
+            return list(self.__header), _batched(self.__data, rows)
+
+        with open(self.__filepath, mode="r", encoding="utf-8") as csv_file:
+            header = self._read_header(csv_file)
+
+        return header, self.iter_chunks(rows=rows)
+
+    def _derive(self, header, rows=None, columns=None):
+        # a new prepared Comma that shares this one's settings, built from
+        # either a list of rows or a list of columns
+        comma = Comma(
+            self.__filepath, 
+            delimiter=self.__delimiter, 
+            storage=self.__storage,
+            engine=self.__engine.name
+        )
+        comma.__configs = dict(self.__configs)
+        comma.__header = list(header)
+        comma.__prepared = True
+
+        if columns is None:
+            comma.__data = comma._new_store(rows)
+        elif self.__storage == "columnar":
+            comma.__data = ColumnStore.from_columns(columns)
+        else:
+            comma.__data = RowStore([list(row) for row in zip(*columns)])
+
+        return comma
+
+    def _join_keys(self, other, on) -> tuple:
+        if on is None:
+            left_key = self.__primary_column_name
+            if left_key is None:
+                left_key = other.__primary_column_name
+            right_key = other.__primary_column_name
+            if right_key is None:
+                right_key = left_key
+
+            if left_key is None:
+                msg = "No join column given and no primary column set. "
+                msg += "Use on=... or assign_primary()"
+                raise Exception(msg)
+
+            return left_key, right_key
+
+        if isinstance(on, tuple) and len(on) == 2:
+            return str(on[0]), str(on[1])
+
+        return str(on), str(on)
+
+    def join(
+        self, 
+        other, 
+        on=None, 
+        how="inner", 
+        strategy="auto", 
+        suffix="_right"
+        ):
+        # on is a column name, a (left, right) pair of names, or None to use
+        # the primary columns
+        if not isinstance(other, Comma):
+            raise ValueError("Argument other must be a Comma")
+
+        if not self.__prepared or not other.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        if how not in join.JOIN_TYPES:
+            msg = "Argument how must be one of " + ", ".join(join.JOIN_TYPES)
+            raise ValueError(msg)
+
+        if strategy not in join.JOIN_STRATEGIES:
+            msg = "Argument strategy must be one of "
+            msg += ", ".join(join.JOIN_STRATEGIES)
+            raise ValueError(msg)
+
+        left_key, right_key = self._join_keys(other, on)
+
+        try: 
+            left_idx = self.__header.index(left_key)
+        except ValueError:
+            raise ValueError("Column " + left_key + " does not exist")
+
+        try: 
+            right_idx = other.__header.index(right_key)
+        except ValueError:
+            raise ValueError("Column " + right_key + " does not exist")
+
+        left_keys = [str(key) for key in self.__data.column(left_idx)]
+        right_keys = [str(key) for key in other.__data.column(right_idx)]
+
+        if strategy == "auto":
+            strategy = join.choose_strategy(left_keys, right_keys)
+
+        if strategy == "hash":
+            # reuse an index the right side already maintains
+            right_index = None
+            if other.__primary_column_name == right_key:
+                right_index = other._get_primary_index()
+            elif isinstance(other._get_index(right_key), HashIndex):
+                right_index = other._get_index(right_key)
+
+            left_rows, right_rows = join.hash_join(
+                left_keys, right_keys, how, right_index
+            )
+        else:
+            left_rows, right_rows = join.sort_merge_join(
+                left_keys, right_keys, how
+            )
+
+        # untouched columns of columnar tables are taken from the existing
+        # column containers, so no value is turned into str and parsed
+        # again; under row storage the output references the existing str
+        # objects
+        left_parts = None
+        right_parts = None
+        if self.__storage == "columnar":
+            if None not in left_rows:
+                left_parts = self.__data.parts()
+            if other.__storage == "columnar" and None not in right_rows:
+                right_parts = other.__data.parts()
+
+        header = list(self.__header)
+        columns = []
+        for c in range(len(self.__header)):
+            if c == left_idx:
+                columns.append([
+                    left_keys[i] if i is not None else right_keys[j]
+                    for i, j in zip(left_rows, right_rows)
+                ])
+            elif left_parts is not None:
+                columns.append(left_parts[c].take(left_rows))
+            else:
+                values = self.__data.column(c)
+                columns.append([
+                    values[i] if i is not None else "" for i in left_rows
+                ])
+
+        for c in range(len(other.__header)):
+            if c == right_idx:
+                continue
+
+            column_name = other.__header[c]
+            if column_name in header:
+                column_name += suffix
+            header.append(column_name)
+
+            if right_parts is not None:
+                columns.append(right_parts[c].take(right_rows))
+                continue
+
+            values = other.__data.column(c)
+            columns.append([
+                values[j] if j is not None else "" for j in right_rows
+            ])
+
+        return self._derive(header, columns=columns)
+
+    def lazy(self) -> LazyComma:
+        return LazyComma(self)
+
+    def group_by(self, column_names, max_groups=None) -> GroupBy:
+        # max_groups bounds the groups held in memory before spilling
+        return GroupBy(self, column_names, max_groups=max_groups)
 
     def _to_json(self) -> dict:
         if not self.__prepared:
             raise Exception("Must call comma.prepare() first")
 
-        json = {"headers": self.__header, "data": []}
-        for row in self.__data:
-            json_obj = {}
+        return {"headers": self.__header, "data": list(self._iter_json())}
 
-            for i, h in enumerate(self.__header):
-                json_obj[h] = row[i]
+    def _iter_json(self, chunks=None):
+        if chunks is None:
+            chunks = [self.__data]
 
-            json["data"].append(json_obj)
-            
-        self.__json = json
+        for chunk in chunks:
+            for row in chunk:
+                yield dict(zip(self.__header, row))
+
+    def get_json(self, lazy=False):
+        if not lazy:
+            return self._to_json()
 
-    def get_json(self) -> dict:
-        self._to_json()
-        return self.__json
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        # row dicts are built one at a time, on demand
+        return self._iter_json()
 
     def _join_with_delimiter(self, a_list, delimiter=",") -> str:
         return str(delimiter.join(a_list))
 
-    def save_as_csv(self, file_path=None, delimiter=","):
-        if not self.__prepared:
-            raise Exception("Must call comma.prepare() first")
+    def save_as_csv(
+        self, 
+        file_path=None, 
+        delimiter=",", 
+        chunks=None, 
+        batch_size=10_000
+        ):
+        # chunks is an optional iterable of row batches, e.g. iter_chunks(),
+        # exported instead of the prepared data
+        if chunks is None:
+            if not self.__prepared:
+                raise Exception("Must call comma.prepare() first")
+            chunks = _batched(self.__data, batch_size)
 
         if file_path is None:
             file_path = "data.csv"
 
-        with open(file_path, "w") as csv_file:
-            header_string = self._join_with_delimiter(self.__header, delimiter)
-            header_string += "\n"
-            csv_file.write(header_string)
+        chunks = _peeked(chunks)
+
+        with _open_output(file_path) as csv_file:
+            # rows are quoted into an in-memory buffer and written per batch
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+            writer.writerow(self.__header)
 
-            for row in self.__data:
-                row_string = self._join_with_delimiter(row, delimiter)
-                row_string += "\n"
-                csv_file.write(row_string)
+            for chunk in chunks:
+                writer.writerows(chunk)
+                csv_file.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+
+            csv_file.write(buffer.getvalue())
 
         if self.__configs["success_messages"]:
             print("Export completed at " + file_path)
 
-    def save_as_json(self, file_path=None, use_wrapper=True):
-        if not self.__json or self.__json is None:
-            self._to_json()
+    def save_as_json(
+        self, 
+        file_path=None, 
+        use_wrapper=True, 
+        lines=False, 
+        chunks=None, 
+        batch_size=10_000
+        ):
+        # lines=True writes newline-delimited JSON, one object per row
+        if chunks is None and not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
         
         if file_path is None:
             file_path = "data.json"
 
-        with open(file_path, "w") as json_file:
-            if use_wrapper:
-                json.dump(self.__json, json_file)
+        if chunks is not None:
+            chunks = _peeked(chunks)
+
+        rows = self._iter_json(chunks)
+
+        with _open_output(file_path) as json_file:
+            # output matches json.dump of the full structure, byte for byte
+            if lines:
+                separator = "\n"
+            else:
+                separator = ", "
+                if use_wrapper:
+                    json_file.write('{"headers": ')
+                    json_file.write(json.dumps(self.__header))
+                    json_file.write(', "data": ')
+                json_file.write("[")
+
+            first_batch = True
+            for batch in _batched(rows, batch_size):
+                encoded = separator.join(json.dumps(row) for row in batch)
+                if not first_batch:
+                    json_file.write(separator)
+                json_file.write(encoded)
+                first_batch = False
+
+            if lines:
+                if not first_batch:
+                    json_file.write("\n")
             else:
-                data = self.__json["data"]
-                json.dump(data, json_file)
+                json_file.write("]")
+                if use_wrapper:
+                    json_file.write("}")
 
         if self.__configs["success_messages"]:
             print("Export completed at " + file_path)
 
+    async def asave_as_csv(self, *args, executor=None, **kwargs):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            executor, 
+            functools.partial(self.save_as_csv, *args, **kwargs)
+        )
+
+    async def asave_as_json(self, *args, executor=None, **kwargs):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            executor, 
+            functools.partial(self.save_as_json, *args, **kwargs)
+        )
+
     def file_is_closed(self) -> bool:
         return self.__csv_file.closed
 
@@ -355,8 +1507,12 @@ class Comma:
         except ValueError:
             raise ValueError("Argument cannot be converted to String")
 
-        for i in range(len(self.__data)):
-            self.__data[i][column_idx] += str_to_append
+        values = self.__data.column(column_idx)
+        self.__data.set_column(
+            column_idx, 
+            [value + str_to_append for value in values]
+        )
+        self._data_changed(column_idx)
 
         if self.__configs["success_messages"]:
             print("Value append completed.")
@@ -376,10 +1532,14 @@ class Comma:
         except:
             raise ValueError("Arguments cannot be converted to String")
 
-        for i in range(len(self.__data)):
-            if substr.lower() in self.__data[i][column_idx].lower():
-                temp = self.__data[i][column_idx].lower()
-                self.__data[i][column_idx] = temp.replace(substr, replace_with)
+        values = self.__data.column(column_idx)
+        for i in range(len(values)):
+            if substr.lower() in values[i].lower():
+                temp = values[i].lower()
+                values[i] = temp.replace(substr, replace_with)
+
+        self.__data.set_column(column_idx, values)
+        self._data_changed(column_idx)
 
         if self.__configs["success_messages"]:
             print("Value replace completed.")
@@ -405,13 +1565,44 @@ class Comma:
         except:
             raise ValueError("Arguments cannot be converted to String")
 
-        for i in range(len(self.__data)):
+        if self.__data.categories(column_idx) is not None:
+            # only the dictionary is compared and rewritten
+            lowered = changing.lower()
+
+            def change_category(value):
+                if case_matters:
+                    matched = value == changing
+                else:
+                    matched = value.lower() == lowered
+                return change_to if matched else value
+
+            self.__data.map_categories(column_idx, change_category)
+            self._data_changed(column_idx)
+
+            if self.__configs["success_messages"]:
+                print("Value change completed.")
+            return
+
+        changed = []
+        values = self.__data.column(column_idx)
+        for i in range(len(values)):
             if case_matters:
-                if self.__data[i][column_idx] == changing:
-                    self.__data[i][column_idx] = change_to
+                if values[i] == changing:
+                    changed.append(values[i])
+                    values[i] = change_to
             else:
-                if self.__data[i][column_idx].lower() == changing.lower():
-                    self.__data[i][column_idx] = change_to
+                if values[i].lower() == changing.lower():
+                    changed.append(values[i])
+                    values[i] = change_to
+
+        self.__data.set_column(column_idx, values)
+
+        tracked = self.__tracked.get(self.__header[column_idx])
+        if tracked is not None:
+            for value in changed:
+                tracked.remove(value)
+                tracked.add(change_to)
+        self._data_changed(column_idx, tracked=True)
 
         if self.__configs["success_messages"]:
             print("Value change completed.")
@@ -429,18 +1620,19 @@ class Comma:
             msg = "Invalid argument side. Must be 'both', 'right', or 'left'"
             raise ValueError(msg)
 
+        values = self.__data.column(column_idx)
         if side == "both":
-            for i in range(len(self.__data)):
-                self.__data[i][column_idx] = self.__data[i][column_idx].strip()
+            values = [value.strip() for value in values]
         elif side == "right":
-            for i in range(len(self.__data)):
-                self.__data[i][column_idx] = self.__data[i][column_idx].rstrip()
+            values = [value.rstrip() for value in values]
         elif side == "left":
-            for i in range(len(self.__data)):
-                self.__data[i][column_idx] = self.__data[i][column_idx].lstrip()
+            values = [value.lstrip() for value in values]
         else:
             raise ValueError("Argument side must be 'both', 'right', or 'left'")
 
+        self.__data.set_column(column_idx, values)
+        self._data_changed(column_idx)
+
         if self.__configs["success_messages"]:
             print("Column strip completed.")
 
@@ -453,8 +1645,8 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
 
-        for i in range(len(self.__data)):
-            if not self.__data[i][column_idx]:
+        for value in self.__data.column(column_idx):
+            if not value:
                 return True
 
         return False
@@ -474,17 +1666,101 @@ class Comma:
             raise ValueError("Argument cannot be converted to String")
 
         count = 0
-        for i in range(len(self.__data)):
-            if not self.__data[i][column_idx]:
+        values = self.__data.column(column_idx)
+        for i in range(len(values)):
+            if not values[i]:
                 if fill_with:
-                    self.__data[i][column_idx] = fill_with
+                    values[i] = replace_with
                 else:
-                    self.__data[i][column_idx] = "None"
+                    values[i] = "None"
                 count += 1
+
+        if count:
+            self.__data.set_column(column_idx, values)
+            self._data_changed(column_idx)
         
         if self.__configs["success_messages"]:
             print("Fill Count: " + str(count))
 
+    def _column_cache(self, column_idx) -> dict:
+        # derived forms of a column, dropped as soon as its version moves on
+        column_name = self.__header[column_idx]
+        version = (
+            self.__rows_version, 
+            self.__column_versions.get(column_name, 0)
+        )
+
+        entry = self.__column_cache.get(column_name)
+        if entry is None or entry["version"] != version:
+            entry = {"version": version}
+            self.__column_cache[column_name] = entry
+
+        return entry
+
+    def _drop_column_cache(self, column_name):
+        self.__column_cache.pop(column_name, None)
+        versions = self.__column_versions
+        versions[column_name] = versions.get(column_name, 0) + 1
+
+    def _float_values(self, column_idx, ignore_na=False) -> list:
+        # the returned list is shared with the cache and must not be mutated
+        entry = self._column_cache(column_idx)
+
+        if "floats" not in entry:
+            numbers = self.__data.numeric(column_idx)
+            if numbers is not None:
+                entry["floats"] = (list(map(float, numbers)), None)
+            else:
+                values = self.__data.column(column_idx)
+                numbers = []
+                first_na = None
+                for i in range(len(values)):
+                    try:
+                        numbers.append(float(values[i]))
+                    except ValueError:
+                        if first_na is None:
+                            first_na = i
+                entry["floats"] = (numbers, first_na)
+
+        numbers, first_na = entry["floats"]
+        if first_na is not None and not ignore_na:
+            msg = "Value at row " + str(first_na)
+            msg += " cannot be converted to Float. "
+            msg += "To ignore, use ignore_na=True"
+            raise ValueError(msg)
+
+        return numbers
+
+    def _float_array(self, column_idx, ignore_na=False):
+        # None means "use the pure Python path", which also raises the
+        # usual errors for empty columns
+        if not self.__configs["use_numpy"]:
+            return None
+
+        numbers = self._float_values(column_idx, ignore_na)
+        if not numbers:
+            return None
+
+        entry = self._column_cache(column_idx)
+        if "ndarray" not in entry:
+            entry["ndarray"] = numpy.array(numbers, dtype=float)
+
+        return entry["ndarray"]
+
+    def _parse_floats(self, values, ignore_na, offset=0) -> list:
+        column_values = []
+        for i in range(len(values)):
+            try:
+                column_values.append(float(values[i]))
+            except ValueError:
+                if not ignore_na:
+                    msg = "Value at row " + str(offset + i)
+                    msg += " cannot be converted to Float. "
+                    msg += "To ignore, use ignore_na=True"
+                    raise ValueError(msg)
+
+        return column_values
+
     def sum(self, column_name, ignore_na=False) -> float:
         if not self.__prepared:
             raise Exception("Must call comma.prepare() first")
@@ -494,23 +1770,15 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
         
-        result = 0
-        for i in range(len(self.__data)):
-            value = self.__data[i][column_idx]
+        tracked = self._tracked_stats(column_idx, ignore_na)
+        if tracked is not None:
+            return tracked.total
 
-            try:
-                num = float(value)
-                result += num
-            except ValueError:
-                if not ignore_na:
-                    msg = "Value at row " + str(i)
-                    msg += " cannot be converted to Float. "
-                    msg += "To ignore, use ignore_na=True"
-                    raise ValueError(msg)
-                else:
-                    continue
-                
-        return result
+        array = self._float_array(column_idx, ignore_na)
+        if array is not None:
+            return float(array.sum())
+
+        return sum(self._float_values(column_idx, ignore_na))
 
     def median(self, column_name, ignore_na=False) -> float:
         if not self.__prepared:
@@ -521,25 +1789,15 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
         
-        converted_list = []
-        for i in range(len(self.__data)):
-            value = self.__data[i][column_idx]
+        tracked = self._tracked_stats(column_idx, ignore_na)
+        if tracked is not None:
+            return tracked.median()
 
-            try:
-                num = float(value)
-                converted_list.append(num)
-            except ValueError:
-                if not ignore_na:
-                    msg = "Value at row " + str(i)
-                    msg += " cannot be converted to Float. "
-                    msg += "To ignore, use ignore_na=True"
-                    raise ValueError(msg)
-                else:
-                    continue
+        array = self._float_array(column_idx, ignore_na)
+        if array is not None:
+            return float(numpy.median(array))
 
-        converted_list.sort()
-                
-        return statistics.median(converted_list)
+        return stats.median(self._float_values(column_idx, ignore_na))
 
     def mean(self, column_name, ignore_na=False) -> float:
         if not self.__prepared:
@@ -550,23 +1808,15 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
 
-        column_values = []
-        for i in range(len(self.__data)):
-            value = self.__data[i][column_idx]
+        tracked = self._tracked_stats(column_idx, ignore_na)
+        if tracked is not None:
+            return tracked.mean()
 
-            try:
-                num = float(value)
-                column_values.append(num)
-            except ValueError:
-                if not ignore_na:
-                    msg = "Value at row " + str(i)
-                    msg += " cannot be converted to Float. "
-                    msg += "To ignore, use ignore_na=True"
-                    raise ValueError(msg)
-                else:
-                    continue
+        array = self._float_array(column_idx, ignore_na)
+        if array is not None:
+            return float(array.mean())
 
-        return statistics.mean(column_values)
+        return statistics.mean(self._float_values(column_idx, ignore_na))
 
     def stdev(self, column_name, ignore_na=False) -> float:
         if not self.__prepared:
@@ -577,23 +1827,15 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
 
-        column_values = []
-        for i in range(len(self.__data)):
-            value = self.__data[i][column_idx]
+        tracked = self._tracked_stats(column_idx, ignore_na)
+        if tracked is not None:
+            return tracked.stdev()
 
-            try:
-                num = float(value)
-                column_values.append(num)
-            except ValueError:
-                if not ignore_na:
-                    msg = "Value at row " + str(i)
-                    msg += " cannot be converted to Float. "
-                    msg += "To ignore, use ignore_na=True"
-                    raise ValueError(msg)
-                else:
-                    continue
+        array = self._float_array(column_idx, ignore_na)
+        if array is not None and array.size > 1:
+            return float(array.std(ddof=1))
 
-        return statistics.stdev(column_values)
+        return statistics.stdev(self._float_values(column_idx, ignore_na))
 
     def minimum(self, column_name):
         if not self.__prepared:
@@ -604,17 +1846,15 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
 
-        column_values = []
-        for i in range(len(self.__data)):
-            value = self.__data[i][column_idx]
+        tracked = self._tracked_stats(column_idx, ignore_na=True)
+        if tracked is not None:
+            return tracked.minimum()
 
-            try:
-                num = float(value)
-                column_values.append(num)
-            except ValueError:
-                continue
+        array = self._float_array(column_idx, ignore_na=True)
+        if array is not None:
+            return float(array.min())
 
-        return min(column_values)
+        return min(self._float_values(column_idx, ignore_na=True))
 
     def maximum(self, column_name):
         if not self.__prepared:
@@ -625,17 +1865,15 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
 
-        column_values = []
-        for i in range(len(self.__data)):
-            value = self.__data[i][column_idx]
+        tracked = self._tracked_stats(column_idx, ignore_na=True)
+        if tracked is not None:
+            return tracked.maximum()
 
-            try:
-                num = float(value)
-                column_values.append(num)
-            except ValueError:
-                continue
+        array = self._float_array(column_idx, ignore_na=True)
+        if array is not None:
+            return float(array.max())
 
-        return max(column_values)
+        return max(self._float_values(column_idx, ignore_na=True))
 
     def value_counts(self, column_name) -> dict:
         if not self.__prepared:
@@ -646,16 +1884,27 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
 
-        counts = {}
-        for i in range(len(self.__data)):
-            value = str(self.__data[i][column_idx])
-            
-            if value not in counts:
-                counts[value] = 1
+        entry = self._column_cache(column_idx)
+
+        if "value_counts" not in entry:
+            if self.__data.categories(column_idx) is not None:
+                counts = self.__data.category_counts(column_idx)
             else:
-                counts[value] += 1
+                counts = {}
+                for value in self.__data.column(column_idx):
+                    value = str(value)
+                    
+                    if value not in counts:
+                        counts[value] = 1
+                    else:
+                        counts[value] += 1
 
-        return counts
+            entry["value_counts"] = counts
+
+        if self.__sampled is not None and self.__configs["success_messages"]:
+            print("Counts come from a sample. " + self._sample_note())
+
+        return dict(entry["value_counts"])
 
     def unique_values(self, column_name) -> list:
         return list(self.value_counts(column_name).keys())
@@ -669,11 +1918,38 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
         
-        values = []
-        for i in range(len(self.__data)):
-            values.append(self.__data[i][column_idx])
+        return self.__data.column(column_idx)
+
+    def encode_categorical(self, column_name):
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        if self.__storage != "columnar":
+            raise Exception("Categorical columns require storage='columnar'")
+
+        try: 
+            column_idx = self.__header.index(str(column_name))
+        except ValueError:
+            raise ValueError("Column " + str(column_name) + " does not exist")
+
+        self.__data.encode_categorical(column_idx)
+        self._drop_column_cache(self.__header[column_idx])
+
+    def decode_categorical(self, column_name):
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        try: 
+            column_idx = self.__header.index(str(column_name))
+        except ValueError:
+            raise ValueError("Column " + str(column_name) + " does not exist")
 
-        return values
+        if self.__data.categories(column_idx) is None:
+            msg = "Column " + str(column_name) + " is not categorical"
+            raise ValueError(msg)
+
+        self.__data.decode_categorical(column_idx)
+        self._drop_column_cache(self.__header[column_idx])
 
     def change_column_name(self, column_name, change_to):
         if not self.__prepared:
@@ -691,6 +1967,17 @@ class Comma:
             if self.__primary_column_name == str(column_name):
                 self.__primary_column_name = change_to
 
+            if str(column_name) in self.__indexes:
+                entry = self.__indexes.pop(str(column_name))
+                self.__indexes[change_to] = entry
+
+            if str(column_name) in self.__tracked:
+                tracked = self.__tracked.pop(str(column_name))
+                self.__tracked[change_to] = tracked
+
+            self._drop_column_cache(str(column_name))
+            self._drop_column_cache(change_to)
+
         except ValueError:
             print("Column does not exist")
 
@@ -706,8 +1993,8 @@ class Comma:
         if len(data) != self.dimension()["rows"]:
             raise ValueError("Length of data does not match number of rows")
 
-        for i in range(len(self.__data)):
-            self.__data[i].append(str(data[i]))
+        self.__data.append_column([str(value) for value in data])
+        self._drop_column_cache(str(column_name))
 
     def delete_column(self, column_name):
         if not self.__prepared:
@@ -718,9 +2005,15 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(column_name) + " does not exist")
 
-        for i in range(len(self.__data)):
-            self.__data[i].pop(column_idx)
+        if self.__primary_column_name == self.__header[column_idx]:
+            self.__primary_column_name = None
+            self.__primary_index = None
 
+        self.__indexes.pop(self.__header[column_idx], None)
+        self.__tracked.pop(self.__header[column_idx], None)
+        self._drop_column_cache(self.__header[column_idx])
+
+        self.__data.delete_column(column_idx)
         self.__header.pop(column_idx)
 
     def rearrange_columns(self, column_names):
@@ -739,13 +2032,8 @@ class Comma:
                 msg = "Column " + str(column_name) + " does not exist"
                 raise ValueError(msg)
 
-        for i in range(len(self.__data)):
-            rearranged_values = [0] * len(self.__header)
-
-            for j in range(len(self.__header)):
-                rearranged_values[j] = self.__data[i][column_indices[j]]
-
-            self.__data[i] = rearranged_values 
+        self.__data.reorder_columns(column_indices)
+        self._data_changed()
 
         if self.__configs["success_messages"]:
             print("Column rearrangement completed.")
@@ -764,10 +2052,10 @@ class Comma:
         except ValueError:
             raise ValueError("Column " + str(y_column_name) +" does not exist")
 
-        for i in range(len(self.__data)):
-            value_holder = self.__data[i][column_x_idx]
-            self.__data[i][column_x_idx] = self.__data[i][column_y_idx]
-            self.__data[i][column_y_idx] = value_holder
+        column_indices = list(range(len(self.__header)))
+        column_indices[column_x_idx] = column_y_idx
+        column_indices[column_y_idx] = column_x_idx
+        self.__data.reorder_columns(column_indices)
 
         value_holder = self.__header[column_x_idx]
         self.__header[column_x_idx] = self.__header[column_y_idx]
@@ -790,47 +2078,192 @@ class Comma:
             raise Exception("Empty row detected. All rows must have value")
 
         try:
-            value = float(self.__data[42][column_idx])
-            numerical_column_detected = True
+            keys = self._float_values(column_idx)
+            array = self._float_array(column_idx)
         except ValueError:
-            numerical_column_detected = False
+            keys = self.__data.column(column_idx)
+            array = None
 
-        data_copy = None
-        if numerical_column_detected:
-            if reverse:
-                data_copy = sorted(
-                    self.__data, 
-                    key=lambda x: float(x[column_idx]))[::-1]
-            else:
-                data_copy = sorted(
-                    self.__data, 
-                    key=lambda x: float(x[column_idx]))
+        if array is not None:
+            order = numpy.argsort(array, kind="stable").tolist()
         else:
-            if reverse:
-                data_copy = sorted(
-                    self.__data, 
-                    key=lambda x: x[column_idx])[::-1]
-            else:
-                data_copy = sorted(
-                    self.__data, 
-                    key=lambda x: x[column_idx])
+            order = sorted(range(len(keys)), key=keys.__getitem__)
 
-        self.__data = data_copy
+        if reverse:
+            order.reverse()
+
+        self.__data = self.__data.take(order)
+        self._data_changed(tracked=True)
 
         if self.__configs["success_messages"]:
             print("Sort completed")
 
 
-    def column_stats(self, column_name, ignore_na=False) -> dict:
-        return {
-            "column_name": str(column_name),
-            "mean": self.mean(column_name, ignore_na=ignore_na),
-            "median": self.median(column_name, ignore_na=ignore_na),
-            "stdev": self.stdev(column_name, ignore_na=ignore_na),
-            "sum": self.sum(column_name, ignore_na=ignore_na),
-            "minimum": self.minimum(column_name),
-            "maximum": self.maximum(column_name)
-        }
+    def column_stats(
+        self, 
+        column_name, 
+        ignore_na=False, 
+        quantiles=None, 
+        include_nulls=False
+        ) -> dict:
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        try: 
+            column_idx = self.__header.index(str(column_name))
+        except ValueError:
+            raise ValueError("Column " + str(column_name) + " does not exist")
+
+        if quantiles is not None and not isinstance(quantiles, list):
+            raise ValueError("Argument quantiles must be a list")
+
+        # one parse and one pass feed every statistic below
+        values = self._float_values(column_idx, ignore_na)
+        array = self._float_array(column_idx, ignore_na)
+
+        if array is not None and array.size > 1:
+            count = array.size
+            result = {
+                "column_name": str(column_name),
+                "mean": float(array.mean()),
+                "median": float(numpy.median(array)),
+                "stdev": float(array.std(ddof=1)),
+                "sum": float(array.sum()),
+                "minimum": float(array.min()),
+                "maximum": float(array.max())
+            }
+        else:
+            running = stats.RunningStats(values)
+            count = running.count
+            result = {
+                "column_name": str(column_name),
+                "mean": running.mean(),
+                "median": stats.median(values),
+                "stdev": running.stdev(),
+                "sum": running.total,
+                "minimum": running.minimum,
+                "maximum": running.maximum
+            }
+
+        if quantiles:
+            for q in quantiles:
+                if not 0 <= q <= 1:
+                    raise ValueError("Quantile must be between 0 and 1")
+
+            if array is not None:
+                computed = numpy.quantile(array, quantiles).tolist()
+            else:
+                sorted_values = sorted(values)
+                computed = [stats.quantile(sorted_values, q) for q in quantiles]
+
+            result["quantiles"] = dict(zip(quantiles, computed))
+
+        if include_nulls:
+            result["null_count"] = len(self.__data) - count
+
+        if self.__sampled is not None:
+            result["estimate"] = True
+            result["sample"] = dict(self.__sampled)
+
+        return result
+
+    def _summarize(self, column_idx, quantiles) -> dict:
+        array = self._float_array(column_idx, ignore_na=True)
+        if array is not None:
+            return _numpy_summary(array, quantiles)
+
+        return stats.summarize(
+            self._float_values(column_idx, ignore_na=True), 
+            quantiles
+        )
+
+    def describe(self, columns=None, workers=None, quantiles=None):
+        # without columns, every column where most values are numbers
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        if columns is None:
+            column_indices = list(range(len(self.__header)))
+        elif isinstance(columns, list):
+            column_indices = []
+            for column_name in columns:
+                try: 
+                    column_indices.append(self.__header.index(str(column_name)))
+                except ValueError:
+                    msg = "Column " + str(column_name) + " does not exist"
+                    raise ValueError(msg)
+        else:
+            raise ValueError("Argument columns must be a list")
+
+        quantiles = list(quantiles or [])
+        for q in quantiles:
+            if not 0 <= q <= 1:
+                raise ValueError("Quantile must be between 0 and 1")
+
+        if workers is not None:
+            if not isinstance(workers, int) or workers < 1:
+                raise ValueError("Argument workers must be a positive integer")
+
+        if workers is None or workers == 1 or len(column_indices) < 2:
+            summaries = [
+                self._summarize(column_idx, quantiles) 
+                for column_idx in column_indices
+            ]
+        elif self.__configs["use_numpy"]:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                summaries = list(executor.map(
+                    self._summarize, 
+                    column_indices, 
+                    itertools.repeat(quantiles)
+                ))
+        else:
+            # one slice of columns per process, parsed over there
+            slices = [
+                column_indices[i::workers] 
+                for i in range(min(workers, len(column_indices)))
+            ]
+            payloads = []
+            for column_slice in slices:
+                payload = []
+                for column_idx in column_slice:
+                    numbers = self.__data.numeric(column_idx)
+                    if numbers is None:
+                        numbers = self.__data.column(column_idx)
+                    payload.append(numbers)
+                payloads.append(payload)
+
+            with ProcessPoolExecutor(max_workers=len(slices)) as executor:
+                results = executor.map(
+                    _describe_columns, 
+                    payloads, 
+                    itertools.repeat(quantiles)
+                )
+                by_column = {}
+                for column_slice, summaries in zip(slices, results):
+                    by_column.update(zip(column_slice, summaries))
+
+            summaries = [by_column[column_idx] for column_idx in column_indices]
+
+        header = [
+            "column_name", "count", "null_count", "mean", "stdev", 
+            "minimum", "median", "maximum"
+        ]
+        header += ["q" + str(q) for q in quantiles]
+
+        rows = []
+        row_count = len(self.__data)
+        for column_idx, summary in zip(column_indices, summaries):
+            if columns is None and summary["count"] * 2 <= row_count:
+                continue
+
+            row = [self.__header[column_idx], summary["count"]]
+            row.append(row_count - summary["count"])
+            for name in ("mean", "stdev", "minimum", "median", "maximum"):
+                row.append(summary[name])
+            row += summary["quantiles"]
+            rows.append(["" if value is None else str(value) for value in row])
+
+        return self._derive(header, rows)
 
     def find_row(self, primary_column_value) -> int:
         if not self.__prepared:
@@ -839,13 +2272,8 @@ class Comma:
         if self.__primary_column_name is None:
             raise Exception("No primary column detected. Set a primary column")
 
-        primary_column_idx = self.__header.index(self.__primary_column_name)
-
-        row_idx = None
-        for i in range(len(self.__data)):
-            if self.__data[i][primary_column_idx] == str(primary_column_value):
-                row_idx = i
-                break
+        index = self._get_primary_index()
+        row_idx = index.first(str(primary_column_value))
         
         if row_idx is None:
             raise Exception("Could not find row")
@@ -868,28 +2296,21 @@ class Comma:
         except ValueError:
             raise ValueError("Argument cannot be converted to String")
 
-        primary_column_idx = self.__header.index(self.__primary_column_name)
-
-        row_indices = []
-        found_matches_for = []
-        for i in range(len(self.__data)):
-            if self.__data[i][primary_column_idx] in primary_column_values:
-                row_indices.append(i)
-                found_matches_for.append(self.__data[i][primary_column_idx])
-
-                if len(row_indices) == len(primary_column_values):
-                    break
+        index = self._get_primary_index()
 
+        row_indices = set()
         no_matches_for = []
-        if len(row_indices) != len(primary_column_values):
-            for value in primary_column_values:
-                if value not in found_matches_for:
-                    no_matches_for.append(value)
+        for value in primary_column_values:
+            row_idx = index.first(value)
+            if row_idx is None:
+                no_matches_for.append(value)
+            else:
+                row_indices.add(row_idx)
 
-            for non_match in no_matches_for:
-                print("No match was found for primary value " + str(non_match))
+        for non_match in no_matches_for:
+            print("No match was found for primary value " + str(non_match))
 
-        return row_indices
+        return sorted(row_indices)
 
     def delete_row(self, row_idx) -> list[str]:
         if not self.__prepared:
@@ -899,22 +2320,82 @@ class Comma:
             raise ValueError("Invalid argument type. Must be integer")
         
         popped = self.__data.pop(row_idx)
+        self._rows_removed([popped])
         return popped
 
+    def _row_mask(self, rows) -> list:
+        # rows is a collection of row indices or a boolean mask over all rows
+        if not isinstance(rows, (list, tuple, set, frozenset, range)):
+            msg = "Invalid argument type. "
+            msg += "Must be a list, set or boolean mask"
+            raise ValueError(msg)
+
+        length = len(self.__data)
+        if rows and all(isinstance(flag, bool) for flag in rows):
+            if len(rows) != length:
+                raise ValueError("Boolean mask must have one value per row")
+            return list(rows)
+
+        mask = [False] * length
+        for idx in rows:
+            if not isinstance(idx, int):
+                raise ValueError("Row indices must be integers")
+            mask[idx] = True
+
+        return mask
+
+    def _compact(self, mask, keep) -> int:
+        # one pass over the rows instead of a list.pop() per removed row
+        kept = [i for i in range(len(mask)) if mask[i] == keep]
+        removed_count = len(mask) - len(kept)
+        if removed_count == 0:
+            return 0
+
+        removed = []
+        if any(tracked is not None for tracked in self.__tracked.values()):
+            removed = [
+                self.__data[i] for i in range(len(mask)) if mask[i] != keep
+            ]
+
+        self.__data = self.__data.take(kept)
+        self._rows_removed(removed)
+        return removed_count
+
     def delete_rows(self, row_indices):
         if not self.__prepared:
             raise Exception("Must call comma.prepare() first")
 
-        if not isinstance(row_indices, list):
-            raise ValueError("Invalid argument type. Must be a list")
+        count = self._compact(self._row_mask(row_indices), keep=False)
+
+        if self.__configs["success_messages"]:
+            print("Successfully deleted " + str(count) + " rows")
+
+    def keep_rows(self, row_indices):
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        count = self._compact(self._row_mask(row_indices), keep=True)
+
+        if self.__configs["success_messages"]:
+            print("Successfully deleted " + str(count) + " rows")
+
+    def delete_where(self, column_name, fn):
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        try: 
+            column_idx = self.__header.index(str(column_name))
+        except ValueError:
+            raise ValueError("Column " + str(column_name) + " does not exist")
 
-        row_indices.sort(reverse=True)
+        if not callable(fn):
+            raise ValueError("Argument fn must be callable")
 
-        for idx in row_indices:
-            self.__data.pop(idx)
+        mask = [bool(fn(value)) for value in self.__data.column(column_idx)]
+        count = self._compact(mask, keep=False)
 
         if self.__configs["success_messages"]:
-            print("Successfully deleted " + str(len(row_indices)) + " rows")
+            print("Successfully deleted " + str(count) + " rows")
 
     def add_row(self, data):
         if not isinstance(data, list):
@@ -925,9 +2406,42 @@ class Comma:
 
         self.__data.append(data)
 
+        self._rows_added([data], len(self.__data) - 1)
+
         if self.__configs["success_messages"]:
             print("Successfully added row")
 
+    def add_rows(self, rows, batch_size=10_000):
+        # every batch is validated before it is appended, so on an error
+        # the rows of the earlier batches stay added
+        if not self.__prepared:
+            raise Exception("Must call comma.prepare() first")
+
+        width = len(self.__header)
+        count = 0
+        for batch in _batched(rows, batch_size):
+            for i in range(len(batch)):
+                row = batch[i]
+                if isinstance(row, tuple):
+                    batch[i] = row = list(row)
+                elif not isinstance(row, list):
+                    msg = "Incorrect row type at row " + str(count + i)
+                    msg += ". Must be a list"
+                    raise Exception(msg)
+
+                if len(row) != width:
+                    msg = "Length of row " + str(count + i)
+                    msg += " must match the number of columns"
+                    raise Exception(msg)
+
+            first_row_idx = len(self.__data)
+            self.__data.extend(batch)
+            self._rows_added(batch, first_row_idx)
+            count += len(batch)
+
+        if self.__configs["success_messages"]:
+            print("Successfully added " + str(count) + " rows")
+
     def get(self, idx, column_names=[]) -> dict:
         if not isinstance(idx, int):
             raise ValueError("Invalid argument type idx. Must be integer")
@@ -937,9 +2451,10 @@ class Comma:
             raise ValueError(msg)
 
         result = {}
+        row = self.__data[idx]
         if not column_names:
             for i in range(len(self.__header)):
-                result[self.__header[i]] = self.__data[idx][i]
+                result[self.__header[i]] = row[i]
         else:
             column_indices = []
             for column_name in column_names:
@@ -951,7 +2466,7 @@ class Comma:
                     raise ValueError(msg)
 
             for i in range(len(column_indices)):
-                result[column_names[i]] = self.__data[idx][column_indices[i]]
+                result[column_names[i]] = row[column_indices[i]]
 
         return result
 
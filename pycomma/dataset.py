@@ -0,0 +1,308 @@
+"""
+This file contains CommaDataset, a set of csv shards sharing one header
+that is queried as a single table. Aggregations run on every shard in a
+process pool and the partial results are merged; shards can be pruned by
+file name or by the per-shard minimum and maximum of a column.
+
+Column ranges come from a full scan of each shard, done by any
+aggregation on the column or by the first column_ranges() call. Without
+a range_cache file they are only kept in memory, so range pruning pays
+off only after an earlier scan in the same process. With range_cache
+they are saved as JSON and reused until a shard's size or mtime changes.
+"""
+import copy
+import fnmatch
+import glob
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .comma import Comma
+from .lazy import LazyComma
+from .groupby import GroupBy
+from . import stats
+
+
+def _open_shard(path, options) -> Comma:
+    comma = Comma(
+        path,
+        includes_header=options["header"] is None,
+        delimiter=options["delimiter"],
+        engine=options["engine"]
+    )
+    if options["header"] is not None:
+        comma.set_header(list(options["header"]))
+    comma.set_config("success_messages", False)
+    return comma
+
+
+# the shard functions run in worker processes, so they stay module-level
+
+def _shard_header(path, options) -> list:
+    comma = _open_shard(path, options)
+    with open(path, mode="r", encoding="utf-8") as csv_file:
+        return comma._read_header(csv_file)
+
+
+def _shard_stats(path, options, column_name, ignore_na, rows):
+    comma = _open_shard(path, options)
+    running = stats.RunningStats()
+    for numbers in comma._stream_floats(column_name, ignore_na, rows):
+        running.extend(numbers)
+    return running
+
+
+def _shard_value_counts(path, options, column_name, rows) -> dict:
+    return _open_shard(path, options).stream_value_counts(column_name, rows)
+
+
+def _stamp(path) -> tuple:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CommaDataset:
+    def __init__(
+        self,
+        paths,
+        header=None,
+        delimiter=",",
+        engine="fast",
+        workers=None,
+        rows=100_000,
+        range_cache=None
+    ):
+        # paths is a glob pattern or a list of files; header is only
+        # given when the shards have no header line
+        if isinstance(paths, str):
+            paths = sorted(glob.glob(paths))
+        elif isinstance(paths, (list, tuple)):
+            paths = [str(path) for path in paths]
+        else:
+            raise ValueError("Argument paths must be a glob pattern or a list")
+
+        if not paths:
+            raise ValueError("No files found for the dataset")
+
+        if workers is not None:
+            if not isinstance(workers, int) or workers < 1:
+                raise ValueError("Argument workers must be a positive integer")
+
+        self.__paths = paths
+        # derived tables are built from the first shard, even once pruned
+        self.__first_path = paths[0]
+        self.__options = {
+            "header": list(header) if header is not None else None,
+            "delimiter": delimiter,
+            "engine": engine
+        }
+        self.__workers = workers
+        self.__rows = rows
+        # (absolute path, column_name) -> (file stamp, minimum, maximum)
+        self.__range_cache = range_cache
+        self.__ranges = self._load_ranges()
+
+        self.__header = _shard_header(paths[0], self.__options)
+        for path in paths[1:]:
+            if _shard_header(path, self.__options) != self.__header:
+                raise ValueError("Shard " + path + " has a different header")
+
+    def get_paths(self) -> list:
+        return list(self.__paths)
+
+    def get_header(self) -> list:
+        return list(self.__header)
+
+    def _check_column(self, column_name):
+        if str(column_name) not in self.__header:
+            raise ValueError("Column " + str(column_name) + " does not exist")
+
+    def _map(self, fn, paths, *args) -> list:
+        # one task per shard, results in shard order
+        if self.__workers == 1 or len(paths) <= 1:
+            return [fn(path, self.__options, *args) for path in paths]
+
+        with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+            return list(executor.map(
+                fn,
+                paths,
+                itertools.repeat(self.__options),
+                *[itertools.repeat(arg) for arg in args]
+            ))
+
+    def _stats(self, column_name, ignore_na) -> stats.RunningStats:
+        self._check_column(column_name)
+        partials = self._map(
+            _shard_stats,
+            self.__paths,
+            str(column_name),
+            ignore_na,
+            self.__rows
+        )
+
+        merged = stats.RunningStats()
+        for path, partial in zip(self.__paths, partials):
+            self._remember_range(path, column_name, partial)
+            merged.merge(partial)
+        self._save_ranges()
+        return merged
+
+    def _remember_range(self, path, column_name, running):
+        self.__ranges[(os.path.abspath(path), str(column_name))] = (
+            _stamp(path),
+            running.minimum,
+            running.maximum
+        )
+
+    def _load_ranges(self) -> dict:
+        # an unreadable cache is ignored, it is rebuilt on the next scan
+        if self.__range_cache is None:
+            return {}
+
+        try:
+            with open(self.__range_cache, mode="r", encoding="utf-8") as f:
+                entries = json.load(f)
+            return {
+                (path, column_name): ((mtime, size), minimum, maximum)
+                for path, column_name, mtime, size, minimum, maximum
+                in entries
+            }
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def _save_ranges(self):
+        if self.__range_cache is None:
+            return
+
+        entries = [
+            [path, column_name, stamp[0], stamp[1], minimum, maximum]
+            for (path, column_name), (stamp, minimum, maximum)
+            in self.__ranges.items()
+        ]
+        temporary = str(self.__range_cache) + ".tmp"
+        with open(temporary, mode="w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(temporary, self.__range_cache)
+
+    def sum(self, column_name, ignore_na=False) -> float:
+        return self._stats(column_name, ignore_na).total
+
+    def mean(self, column_name, ignore_na=False) -> float:
+        return self._stats(column_name, ignore_na).mean()
+
+    def minimum(self, column_name):
+        result = self._stats(column_name, True).minimum
+        if result is None:
+            raise ValueError("Column " + str(column_name) + " has no values")
+        return result
+
+    def maximum(self, column_name):
+        result = self._stats(column_name, True).maximum
+        if result is None:
+            raise ValueError("Column " + str(column_name) + " has no values")
+        return result
+
+    def value_counts(self, column_name) -> dict:
+        self._check_column(column_name)
+        partials = self._map(
+            _shard_value_counts,
+            self.__paths,
+            str(column_name),
+            self.__rows
+        )
+
+        counts = {}
+        for partial in partials:
+            for value, count in partial.items():
+                counts[value] = counts.get(value, 0) + count
+        return counts
+
+    def unique_values(self, column_name) -> list:
+        return list(self.value_counts(column_name).keys())
+
+    def column_ranges(self, column_name) -> dict:
+        # per-shard (minimum, maximum) of the numbers in a column, or None
+        # for shards without numbers; computed once per shard version
+        self._check_column(column_name)
+        column_name = str(column_name)
+
+        missing = []
+        for path in self.__paths:
+            cached = self.__ranges.get((os.path.abspath(path), column_name))
+            if cached is None or cached[0] != _stamp(path):
+                missing.append(path)
+
+        partials = self._map(
+            _shard_stats,
+            missing,
+            column_name,
+            True,
+            self.__rows
+        )
+        for path, partial in zip(missing, partials):
+            self._remember_range(path, column_name, partial)
+        if missing:
+            self._save_ranges()
+
+        ranges = {}
+        for path in self.__paths:
+            key = (os.path.abspath(path), column_name)
+            stamp, minimum, maximum = self.__ranges[key]
+            ranges[path] = None if minimum is None else (minimum, maximum)
+        return ranges
+
+    def prune(self, pattern=None, column_name=None, lo=None, hi=None):
+        # a new dataset without the shards whose file name does not match
+        # pattern or whose column range lies outside [lo, hi]
+        paths = self.__paths
+        if pattern is not None:
+            paths = [
+                path for path in paths
+                if fnmatch.fnmatch(os.path.basename(path), pattern)
+            ]
+
+        if column_name is not None:
+            ranges = self._subset(paths).column_ranges(column_name)
+            kept = []
+            for path in paths:
+                shard_range = ranges[path]
+                if shard_range is None:
+                    continue
+                if lo is not None and shard_range[1] < lo:
+                    continue
+                if hi is not None and shard_range[0] > hi:
+                    continue
+                kept.append(path)
+            paths = kept
+
+        return self._subset(paths)
+
+    def _subset(self, paths):
+        # shares the range cache with this dataset
+        dataset = copy.copy(self)
+        dataset.__paths = list(paths)
+        return dataset
+
+    def iter_chunks(self, rows=100_000):
+        for path in self.__paths:
+            yield from _open_shard(path, self.__options).iter_chunks(rows=rows)
+
+    def _scan(self, rows=100_000):
+        return self.get_header(), self.iter_chunks(rows=rows)
+
+    def _derive(self, header, rows=None, columns=None):
+        shard = _open_shard(self.__first_path, self.__options)
+        return shard._derive(header, rows, columns)
+
+    def to_comma(self) -> Comma:
+        rows = []
+        for chunk in self.iter_chunks():
+            rows.extend(chunk)
+        return self._derive(self.__header, rows)
+
+    def lazy(self) -> LazyComma:
+        return LazyComma(self)
+
+    def group_by(self, column_names, max_groups=None) -> GroupBy:
+        return GroupBy(self, column_names, max_groups=max_groups)
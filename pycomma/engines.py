@@ -0,0 +1,268 @@
+"""
+This file contains the parser engines used by class Comma to turn csv
+text into rows. Engines read the file in large text blocks that end on a
+record boundary and keep throughput stats of the time spent parsing.
+
+    fast  splits blocks on newlines and the delimiter, quotes are kept as
+          plain characters (the original pycomma behaviour)
+    csv   parses every block with the stdlib csv reader, so quoted fields
+          and embedded newlines are handled
+    auto  uses the fast path for blocks without quotes and the csv reader
+          for the others
+"""
+import csv
+import io
+import time
+
+
+def _split_line(line, delimiter) -> list:
+    line = line.split(delimiter)
+    line[-1] = line[-1].replace("\n", "")
+    return line
+
+
+def quote_state(text, delimiter, inside=False) -> tuple:
+    # (inside, position of the last quote that opened a field) at the end of
+    # text; like the csv module, a quote only opens a field at its start and
+    # a doubled quote inside a quoted field is a literal quote
+    opened = None
+    find = text.find
+    i = find('"')
+    while i != -1:
+        if inside:
+            if text[i + 1:i + 2] == '"':
+                i = find('"', i + 2)
+                continue
+            inside = False
+        elif i == 0 or text[i - 1] in (delimiter, "\n", "\r"):
+            inside = True
+            opened = i
+        i = find('"', i + 1)
+
+    return inside, opened
+
+
+def select_rows(rows, plan) -> list:
+    # plan is (last, positions, tests, row_test, header): tests are
+    # (position, fn) pairs and row_test gets the whole row as a dict
+    last, positions, tests, row_test, header = plan
+
+    selected = []
+    for fields in rows:
+        try:
+            if not all(fn(fields[i]) for i, fn in tests):
+                continue
+            if row_test is not None and not row_test(dict(zip(header, fields))):
+                continue
+            selected.append([fields[i] for i in positions])
+        except IndexError:
+            msg = "Row has fewer values than the header: "
+            raise ValueError(msg + str(fields))
+
+    return selected
+
+
+def split_rows(lines, delimiter, plan=None) -> list:
+    if plan is None:
+        return [_split_line(line, delimiter) for line in lines]
+
+    # without a row test, lines are split only up to field last + 1
+    last, positions, tests, row_test, header = plan
+    maxsplit = -1 if row_test is not None else last + 1
+
+    rows = []
+    for line in lines:
+        fields = line.split(delimiter, maxsplit)
+        if maxsplit == -1 or len(fields) <= last + 1:
+            fields[-1] = fields[-1].replace("\n", "")
+        rows.append(fields)
+
+    return select_rows(rows, plan)
+
+
+class Engine:
+    name = None
+    # quote-aware engines never end a block inside a quoted field
+    quoted = True
+    # lines read past a block to close a quoted field before giving up
+    quote_lookahead = 10_000
+
+    def __init__(self, delimiter=",", block_size=1 << 20):
+        self.delimiter = delimiter
+        self.block_size = block_size
+        self.__rows = 0
+        self.__characters = 0
+        self.__seconds = 0.0
+        self.__blocks = {}
+
+    def _parse_block(self, block, plan) -> tuple:
+        # returns (rows, name of the path that parsed the block)
+        raise NotImplementedError
+
+    def parse_header(self, line) -> list:
+        # not counted in the stats; an empty file has the header [""], like
+        # the fast engine
+        rows = self._parse_block(line, None)[0]
+        if not rows:
+            return [""]
+        return rows[0]
+
+    def parse(self, block, plan=None) -> list:
+        start = time.perf_counter()
+        rows, path = self._parse_block(block, plan)
+        self.__seconds += time.perf_counter() - start
+        self.__rows += len(rows)
+        self.__characters += len(block)
+        self.__blocks[path] = self.__blocks.get(path, 0) + 1
+        return rows
+
+    def parse_range(self, block, plan=None) -> list:
+        # a block cut at newlines by a parallel read
+        if self.quoted and quote_state(block, self.delimiter)[0]:
+            msg = "Quoted field spans a parallel read boundary. "
+            msg += "Use workers=None for this file"
+            raise ValueError(msg)
+        return self.parse(block, plan)
+
+    def blocks(self, csv_file):
+        # lines read so far, for the line number of an unclosed quote
+        line_count = 0
+        while True:
+            block = csv_file.read(self.block_size)
+            if not block:
+                return
+
+            if not block.endswith("\n"):
+                block += csv_file.readline()
+
+            if self.quoted:
+                if '"' in block:
+                    block = self._close_quote(csv_file, block, line_count)
+                line_count += block.count("\n")
+
+            yield block
+
+    def _close_quote(self, csv_file, block, line_count) -> str:
+        # appends lines until the quoted field open at the end of block is
+        # closed; only the appended line is scanned each time
+        inside, opened = quote_state(block, self.delimiter)
+        if not inside:
+            return block
+
+        opened_line = line_count + block.count("\n", 0, opened) + 1
+        block_lines = block.count("\n")
+        pieces = [block]
+        for i in range(self.quote_lookahead):
+            line = csv_file.readline()
+            if not line:
+                break
+            pieces.append(line)
+
+            inside, opened = quote_state(line, self.delimiter, inside)
+            if not inside:
+                break
+            if opened is not None:
+                opened_line = line_count + block_lines + i + 1
+        else:
+            msg = "Quoted field opened on line " + str(opened_line)
+            msg += " after the header is not closed within "
+            msg += str(self.quote_lookahead) + " lines"
+            raise ValueError(msg)
+
+        return "".join(pieces)
+
+    def read(self, csv_file, rows, plan=None):
+        # chunks of at most rows rows, parsed a block at a time
+        pending = []
+        for block in self.blocks(csv_file):
+            pending.extend(self.parse(block, plan))
+
+            start = 0
+            while len(pending) - start >= rows:
+                yield pending[start:start + rows]
+                start += rows
+            pending = pending[start:]
+
+        if pending:
+            yield pending
+
+    def stats(self) -> dict:
+        seconds = self.__seconds
+        return {
+            "engine": self.name,
+            "rows": self.__rows,
+            "characters": self.__characters,
+            "seconds": seconds,
+            "rows_per_second": self.__rows / seconds if seconds else None,
+            "characters_per_second":
+                self.__characters / seconds if seconds else None,
+            "blocks": dict(self.__blocks)
+        }
+
+    def merge_stats(self, stats):
+        self.__rows += stats["rows"]
+        self.__characters += stats["characters"]
+        self.__seconds += stats["seconds"]
+        for path, count in stats["blocks"].items():
+            self.__blocks[path] = self.__blocks.get(path, 0) + count
+
+
+class FastEngine(Engine):
+    name = "fast"
+    quoted = False
+
+    def parse_header(self, line) -> list:
+        return _split_line(line, self.delimiter)
+
+    def _parse_block(self, block, plan) -> tuple:
+        lines = block.split("\n")
+        if "" in lines:
+            # blank lines are not rows, as with the csv module
+            lines = [line for line in lines if line]
+
+        if plan is None:
+            # lines carry no newline here, so a bare split is enough
+            delimiter = self.delimiter
+            return [line.split(delimiter) for line in lines], "fast"
+        return split_rows(lines, self.delimiter, plan), "fast"
+
+
+class CsvEngine(Engine):
+    name = "csv"
+
+    def _parse_block(self, block, plan) -> tuple:
+        rows = list(csv.reader(io.StringIO(block), delimiter=self.delimiter))
+        if [] in rows:
+            rows = [row for row in rows if row]
+        if plan is not None:
+            rows = select_rows(rows, plan)
+        return rows, "csv"
+
+
+class AutoEngine(Engine):
+    name = "auto"
+
+    def __init__(self, delimiter=",", block_size=1 << 20):
+        super().__init__(delimiter, block_size)
+        self.__fast = FastEngine(delimiter)
+        self.__csv = CsvEngine(delimiter)
+
+    def _parse_block(self, block, plan) -> tuple:
+        if '"' in block:
+            return self.__csv._parse_block(block, plan)
+        return self.__fast._parse_block(block, plan)
+
+
+ENGINES = {
+    "fast": FastEngine,
+    "csv": CsvEngine,
+    "auto": AutoEngine
+}
+
+
+def create(name, delimiter=",", block_size=1 << 20) -> Engine:
+    if name not in ENGINES:
+        msg = "Argument engine must be one of " + ", ".join(ENGINES)
+        raise ValueError(msg)
+
+    return ENGINES[name](delimiter, block_size)
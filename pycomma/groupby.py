@@ -0,0 +1,135 @@
+"""
+This file contains the hash aggregation behind Comma.group_by(). Groups
+are aggregated in a single pass; when there are more groups than
+max_groups, the partial aggregates are spilled to temporary files split
+by key hash and merged one partition at a time at the end. A partition
+that still holds more than max_groups groups is spilled again with a
+different hash, so no merge ever holds more than max_groups groups.
+"""
+import os
+import pickle
+import tempfile
+
+from . import stats
+
+
+class GroupBy:
+    def __init__(self, source, column_names, max_groups=None, partitions=16):
+        if not isinstance(column_names, list):
+            column_names = [column_names]
+
+        if max_groups is not None:
+            if not isinstance(max_groups, int) or max_groups < 1:
+                msg = "Argument max_groups must be a positive integer"
+                raise ValueError(msg)
+
+        self.__source = source
+        self.__column_names = [str(c) for c in column_names]
+        self.__max_groups = max_groups
+        self.__partitions = partitions
+
+    def agg(self, aggregations):
+        spec = stats.aggregation_spec(aggregations)
+        header, chunks = self.__source._scan()
+
+        for column_name in self.__column_names + list(spec):
+            if column_name not in header:
+                msg = "Column " + str(column_name) + " does not exist"
+                raise ValueError(msg)
+        key_positions = [header.index(c) for c in self.__column_names]
+        value_positions = [header.index(c) for c in spec]
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            spill_files = []
+            groups = {}
+
+            for chunk in chunks:
+                for row in chunk:
+                    key = tuple(row[i] for i in key_positions)
+                    accumulators = groups.get(key)
+                    if accumulators is None:
+                        # spill before a new key would exceed max_groups
+                        if self.__max_groups is not None and \
+                            len(groups) >= self.__max_groups:
+                            spill_files.append(
+                                self._spill(groups, spill_dir, 0)
+                            )
+                            groups = {}
+
+                        accumulators = [stats.Aggregate() for _ in spec]
+                        groups[key] = accumulators
+
+                    for accumulator, idx in zip(accumulators, value_positions):
+                        accumulator.add(row[idx])
+
+            if spill_files:
+                spill_files.append(self._spill(groups, spill_dir, 0))
+                groups = None
+
+            rows = []
+            partitions = self._partitions(groups, spill_files, spill_dir, 1)
+            for partition_groups in partitions:
+                for key, accumulators in partition_groups.items():
+                    row = list(key)
+                    for accumulator, names in zip(accumulators, spec.values()):
+                        for name in names:
+                            result = accumulator.result(name)
+                            row.append(stats.format_value(result))
+                    rows.append(row)
+
+        output_header = self.__column_names + stats.aggregation_header(spec)
+        return self.__source._derive(output_header, rows)
+
+    def _spill(self, groups, spill_dir, depth) -> list:
+        # one file per hash partition, each holding (key, accumulators)
+        # pairs; the depth is hashed in so a re-spill splits a partition
+        buckets = [[] for _ in range(self.__partitions)]
+        for key, accumulators in groups.items():
+            partition = hash((depth, key)) % self.__partitions
+            buckets[partition].append((key, accumulators))
+
+        paths = []
+        for bucket in buckets:
+            handle, path = tempfile.mkstemp(dir=spill_dir)
+            with os.fdopen(handle, "wb") as spill_file:
+                pickle.dump(bucket, spill_file, pickle.HIGHEST_PROTOCOL)
+            paths.append(path)
+
+        return paths
+
+    def _partitions(self, groups, spill_files, spill_dir, depth):
+        if groups is not None:
+            yield groups
+            return
+
+        for partition in range(self.__partitions):
+            merged = {}
+            respilled = []
+            for paths in spill_files:
+                with open(paths[partition], "rb") as spill_file:
+                    bucket = pickle.load(spill_file)
+                os.remove(paths[partition])
+
+                for key, accumulators in bucket:
+                    existing = merged.get(key)
+                    if existing is not None:
+                        for target, partial in zip(existing, accumulators):
+                            target.merge(partial)
+                        continue
+
+                    if len(merged) >= self.__max_groups:
+                        respilled.append(
+                            self._spill(merged, spill_dir, depth)
+                        )
+                        merged = {}
+                    merged[key] = accumulators
+
+            if respilled:
+                respilled.append(self._spill(merged, spill_dir, depth))
+                merged = None
+            yield from self._partitions(
+                merged,
+                respilled,
+                spill_dir,
+                depth + 1
+            )
@@ -0,0 +1,128 @@
+"""
+This file contains the lookup indexes used by class Comma.
+"""
+import bisect
+
+
+class HashIndex:
+    """
+    Maps each value of a column to the row indices holding it.
+    """
+
+    def __init__(self, values=()):
+        self.__rows = {}
+        self.__duplicates = False
+        self.build(values)
+
+    def __len__(self):
+        return len(self.__rows)
+
+    def build(self, values):
+        # a value seen once maps to an int, repeated values to a list
+        self.__rows = {}
+        self.__duplicates = False
+        for row_idx, value in enumerate(values):
+            self.add(value, row_idx)
+
+    def add(self, value, row_idx):
+        existing = self.__rows.get(value)
+        if existing is None:
+            self.__rows[value] = row_idx
+        elif isinstance(existing, list):
+            existing.append(row_idx)
+        else:
+            self.__rows[value] = [existing, row_idx]
+            self.__duplicates = True
+
+    def has_duplicates(self) -> bool:
+        return self.__duplicates
+
+    def lookup(self, value) -> list:
+        rows = self.__rows.get(value)
+        if rows is None:
+            return []
+        if isinstance(rows, list):
+            return list(rows)
+        return [rows]
+
+    def first(self, value):
+        rows = self.__rows.get(value)
+        if isinstance(rows, list):
+            return rows[0]
+        return rows
+
+
+class SortedIndex:
+    """
+    Keeps (key, row index) pairs ordered by key for range and prefix
+    queries. Columns whose values all parse as float are keyed by number,
+    every other column by its text.
+    """
+
+    def __init__(self, values=()):
+        self.__keys = []
+        self.__rows = []
+        self.__numeric = True
+        self.build(values)
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def is_numeric(self) -> bool:
+        return self.__numeric
+
+    def build(self, values):
+        values = list(values)
+        try:
+            keys = [float(value) for value in values]
+            self.__numeric = True
+        except ValueError:
+            keys = values
+            self.__numeric = False
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.__keys = [keys[i] for i in order]
+        self.__rows = order
+
+    def _key(self, value):
+        if self.__numeric:
+            return float(value)
+        return str(value)
+
+    def add(self, value, row_idx) -> bool:
+        # returns False when the value does not fit the key type
+        try:
+            key = self._key(value)
+        except ValueError:
+            return False
+
+        position = bisect.bisect_right(self.__keys, key)
+        self.__keys.insert(position, key)
+        self.__rows.insert(position, row_idx)
+        return True
+
+    def lookup(self, value) -> list:
+        return self.between(value, value)
+
+    def between(self, lo=None, hi=None) -> list:
+        start = 0
+        end = len(self.__keys)
+
+        if lo is not None:
+            start = bisect.bisect_left(self.__keys, self._key(lo))
+        if hi is not None:
+            end = bisect.bisect_right(self.__keys, self._key(hi))
+
+        return sorted(self.__rows[start:end])
+
+    def prefix(self, prefix) -> list:
+        if self.__numeric:
+            raise ValueError("Prefix queries need a text column")
+
+        prefix = str(prefix)
+        start = bisect.bisect_left(self.__keys, prefix)
+        end = start
+        while end < len(self.__keys) and self.__keys[end].startswith(prefix):
+            end += 1
+
+        return sorted(self.__rows[start:end])
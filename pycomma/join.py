@@ -0,0 +1,115 @@
+"""
+This file contains the join algorithms behind Comma.join(). Both work on
+the key columns only and return matching (left row, right row) index
+pairs, with None standing for the missing side of a left or outer join.
+"""
+from .index import HashIndex
+
+JOIN_TYPES = ("inner", "left", "outer")
+JOIN_STRATEGIES = ("auto", "hash", "sort_merge")
+
+# right sides with more rows than this are joined with sort-merge by "auto"
+HASH_JOIN_LIMIT = 5_000_000
+
+
+def _is_sorted(keys) -> bool:
+    return all(keys[i] <= keys[i + 1] for i in range(len(keys) - 1))
+
+
+def choose_strategy(left_keys, right_keys) -> str:
+    if len(right_keys) > HASH_JOIN_LIMIT:
+        return "sort_merge"
+    if _is_sorted(left_keys) and _is_sorted(right_keys):
+        return "sort_merge"
+    return "hash"
+
+
+def hash_join(left_keys, right_keys, how, right_index=None):
+    # right_index may be an existing HashIndex over right_keys
+    if right_index is None:
+        right_index = HashIndex(right_keys)
+
+    left_rows = []
+    right_rows = []
+    matched = set()
+
+    for i, key in enumerate(left_keys):
+        matches = right_index.lookup(key)
+        if matches:
+            for j in matches:
+                left_rows.append(i)
+                right_rows.append(j)
+            if how == "outer":
+                matched.update(matches)
+        elif how != "inner":
+            left_rows.append(i)
+            right_rows.append(None)
+
+    if how == "outer":
+        for j in range(len(right_keys)):
+            if j not in matched:
+                left_rows.append(None)
+                right_rows.append(j)
+
+    return left_rows, right_rows
+
+
+def sort_merge_join(left_keys, right_keys, how):
+    left_order = sorted(range(len(left_keys)), key=left_keys.__getitem__)
+    right_order = sorted(range(len(right_keys)), key=right_keys.__getitem__)
+
+    left_rows = []
+    right_rows = []
+    a = 0
+    b = 0
+
+    while a < len(left_order) and b < len(right_order):
+        left_key = left_keys[left_order[a]]
+        right_key = right_keys[right_order[b]]
+
+        if left_key < right_key:
+            if how != "inner":
+                left_rows.append(left_order[a])
+                right_rows.append(None)
+            a += 1
+        elif left_key > right_key:
+            if how == "outer":
+                left_rows.append(None)
+                right_rows.append(right_order[b])
+            b += 1
+        else:
+            # pair every row of the two runs of equal keys
+            a_end = a
+            while a_end < len(left_order) and \
+                left_keys[left_order[a_end]] == left_key:
+                a_end += 1
+            b_end = b
+            while b_end < len(right_order) and \
+                right_keys[right_order[b_end]] == right_key:
+                b_end += 1
+
+            for i in left_order[a:a_end]:
+                for j in right_order[b:b_end]:
+                    left_rows.append(i)
+                    right_rows.append(j)
+
+            a = a_end
+            b = b_end
+
+    if how != "inner":
+        for i in left_order[a:]:
+            left_rows.append(i)
+            right_rows.append(None)
+
+    if how == "outer":
+        for j in right_order[b:]:
+            left_rows.append(None)
+            right_rows.append(j)
+
+    # back to the order hash_join returns: left rows in order, then the
+    # unmatched right rows
+    pairs = sorted(
+        zip(left_rows, right_rows),
+        key=lambda pair: (pair[0] is None, pair[0] or 0, pair[1] or 0)
+    )
+    return [pair[0] for pair in pairs], [pair[1] for pair in pairs]
@@ -0,0 +1,303 @@
+"""
+This file contains the lazy query builder returned by Comma.lazy(). A
+LazyComma only records steps; the plan is optimized and run in a single
+scan over the source when collect() or one of the save functions is
+called.
+"""
+import operator
+
+from . import stats
+
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+
+
+def cell_test(op, value):
+    # a callable op is used as-is as a predicate on the cell value
+    if callable(op):
+        return op
+
+    if op not in COMPARISONS:
+        msg = "Argument op must be a callable or one of "
+        msg += ", ".join(COMPARISONS)
+        raise ValueError(msg)
+
+    compare = COMPARISONS[op]
+
+    # a numeric value compares numerically, cells that are not numbers fail
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        text = str(value)
+        return lambda cell: compare(cell, text)
+
+    def test(cell):
+        try:
+            return compare(float(cell), number)
+        except ValueError:
+            return False
+
+    return test
+
+
+class LazyComma:
+    def __init__(self, source, steps=()):
+        self.__source = source
+        self.__steps = list(steps)
+
+    def _then(self, step):
+        if self.__steps and self.__steps[-1][0] == "agg":
+            raise Exception("agg() must be the last step of a lazy query")
+        return LazyComma(self.__source, self.__steps + [step])
+
+    def filter(self, column_name, op, value=None):
+        return self._then(("filter", str(column_name), cell_test(op, value)))
+
+    def select(self, column_names):
+        if not isinstance(column_names, list):
+            raise ValueError("Argument column_names must be a list")
+
+        return self._then(("select", [str(c) for c in column_names]))
+
+    def with_column(self, column_name, fn, column_names=None):
+        # fn gets the values of column_names as arguments, or a dict of the
+        # whole row when column_names is None
+        if not callable(fn):
+            raise ValueError("Argument fn must be callable")
+
+        if column_names is not None:
+            if not isinstance(column_names, list):
+                raise ValueError("Argument column_names must be a list")
+            column_names = [str(c) for c in column_names]
+
+        return self._then(("with_column", str(column_name), fn, column_names))
+
+    def agg(self, aggregations):
+        return self._then(("agg", stats.aggregation_spec(aggregations)))
+
+    def _validate(self, header) -> list:
+        schema = list(header)
+
+        def check(column_name):
+            if column_name not in schema:
+                msg = "Column " + str(column_name) + " does not exist"
+                raise ValueError(msg)
+
+        for step in self.__steps:
+            if step[0] == "filter":
+                check(step[1])
+            elif step[0] == "select":
+                for column_name in step[1]:
+                    check(column_name)
+                schema = list(step[1])
+            elif step[0] == "with_column":
+                for column_name in step[3] or []:
+                    check(column_name)
+                if step[1] not in schema:
+                    schema.append(step[1])
+            elif step[0] == "agg":
+                for column_name in step[1]:
+                    check(column_name)
+                schema = stats.aggregation_header(step[1])
+
+        return schema
+
+    def _optimize(self, header):
+        # filters on columns that no earlier with_column step writes are
+        # moved to the front so rejected rows are never transformed
+        pushed = []
+        rest = []
+        produced = set()
+        for step in self.__steps:
+            if step[0] == "filter" and step[1] not in produced:
+                pushed.append(step)
+            else:
+                rest.append(step)
+                if step[0] == "with_column":
+                    produced.add(step[1])
+        steps = pushed + rest
+
+        # walk backwards to find the source columns the plan really needs;
+        # None means all of them
+        needed = None
+        kept = []
+        for step in reversed(steps):
+            if step[0] == "agg":
+                needed = set(step[1])
+            elif step[0] == "select":
+                # columns of the select that no later step reads are
+                # dropped, they are not scanned either
+                if needed is not None:
+                    step = ("select", [c for c in step[1] if c in needed])
+                needed = set(step[1])
+            elif step[0] == "filter":
+                if needed is not None:
+                    needed.add(step[1])
+            elif step[0] == "with_column" and needed is not None:
+                if step[1] not in needed:
+                    # the computed column is never read, drop the step
+                    continue
+                needed.discard(step[1])
+                if step[3] is None:
+                    needed = None
+                else:
+                    needed.update(step[3])
+            kept.append(step)
+        kept.reverse()
+
+        if needed is None:
+            columns = list(header)
+        else:
+            columns = [c for c in header if c in needed]
+
+        return columns, kept
+
+    def explain(self) -> list:
+        header, chunks = self.__source._scan()
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+        self._validate(header)
+        columns, steps = self._optimize(header)
+
+        plan = ["scan " + ", ".join(columns)]
+        for step in steps:
+            if step[0] in ("filter", "with_column"):
+                plan.append(step[0] + " " + step[1])
+            elif step[0] == "select":
+                plan.append("select " + ", ".join(step[1]))
+            else:
+                plan.append("agg " + ", ".join(step[1]))
+
+        return plan
+
+    def _compile(self, header):
+        schema = self._validate(header)
+        columns, steps = self._optimize(header)
+
+        projection = None
+        if columns != list(header):
+            projection = [header.index(c) for c in columns]
+
+        current = list(columns)
+        compiled = []
+        for step in steps:
+            if step[0] == "filter":
+                compiled.append(("filter", current.index(step[1]), step[2]))
+            elif step[0] == "select":
+                positions = [current.index(c) for c in step[1]]
+                compiled.append(("select", positions))
+                current = list(step[1])
+            elif step[0] == "with_column":
+                inputs = None
+                if step[3] is not None:
+                    inputs = [current.index(c) for c in step[3]]
+                target = None
+                if step[1] in current:
+                    target = current.index(step[1])
+                compiled.append(
+                    ("with_column", step[2], inputs, list(current), target)
+                )
+                if target is None:
+                    current.append(step[1])
+            elif step[0] == "agg":
+                positions = [current.index(c) for c in step[1]]
+                compiled.append(("agg", positions, list(step[1].values())))
+
+        # rows coming straight from prepared data must be copied on collect
+        fresh = projection is not None or \
+            any(step[0] != "filter" for step in compiled)
+
+        return schema, projection, compiled, fresh
+
+    def _run(self, projection, compiled, chunks):
+        aggregate = None
+        if compiled and compiled[-1][0] == "agg":
+            aggregate = [
+                stats.Aggregate() for _ in compiled[-1][1]
+            ]
+
+        for chunk in chunks:
+            rows = chunk
+            if projection is not None:
+                rows = [[row[i] for i in projection] for row in rows]
+
+            for step in compiled:
+                if step[0] == "filter":
+                    idx, test = step[1], step[2]
+                    rows = [row for row in rows if test(row[idx])]
+                elif step[0] == "select":
+                    positions = step[1]
+                    rows = [[row[i] for i in positions] for row in rows]
+                elif step[0] == "with_column":
+                    rows = self._with_column(rows, *step[1:])
+                elif step[0] == "agg":
+                    for row in rows:
+                        for accumulator, idx in zip(aggregate, step[1]):
+                            accumulator.add(row[idx])
+                    rows = []
+
+            if rows:
+                yield rows
+
+        if aggregate is not None:
+            yield [[
+                stats.format_value(accumulator.result(name))
+                for accumulator, names in zip(aggregate, compiled[-1][2])
+                for name in names
+            ]]
+
+    def _with_column(self, rows, fn, inputs, schema, target):
+        result = []
+        for row in rows:
+            if inputs is None:
+                value = fn(dict(zip(schema, row)))
+            else:
+                value = fn(*[row[i] for i in inputs])
+
+            row = list(row)
+            if target is None:
+                row.append(stats.format_value(value))
+            else:
+                row[target] = stats.format_value(value)
+            result.append(row)
+
+        return result
+
+    def _execute(self, rows=100_000):
+        header, chunks = self.__source._scan(rows)
+        schema, projection, compiled, fresh = self._compile(header)
+        return schema, self._run(projection, compiled, chunks), fresh
+
+    def collect(self):
+        schema, chunks, fresh = self._execute()
+
+        result = []
+        for chunk in chunks:
+            if fresh:
+                result.extend(chunk)
+            else:
+                result.extend(list(row) for row in chunk)
+
+        return self.__source._derive(schema, result)
+
+    def save_as_csv(self, file_path=None, delimiter=","):
+        schema, chunks, fresh = self._execute()
+        output = self.__source._derive(schema, [])
+        output.save_as_csv(file_path, delimiter=delimiter, chunks=chunks)
+
+    def save_as_json(self, file_path=None, use_wrapper=True, lines=False):
+        schema, chunks, fresh = self._execute()
+        output = self.__source._derive(schema, [])
+        output.save_as_json(
+            file_path,
+            use_wrapper=use_wrapper,
+            lines=lines,
+            chunks=chunks
+        )
@@ -0,0 +1,170 @@
+"""
+This file contains the mergeable sketches behind the approximate
+functions of class Comma. HyperLogLog estimates distinct counts and
+KLLSketch estimates quantiles, both in bounded memory. Sketches built
+over different chunks, files or processes can be merged, as long as
+they were created with the same parameters.
+"""
+import hashlib
+import math
+import random
+
+
+def _hash64(value) -> int:
+    # stable across processes, unlike hash()
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        if not isinstance(precision, int) or not 4 <= precision <= 18:
+            raise ValueError("Argument precision must be an int from 4 to 18")
+
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        x = _hash64(value)
+        idx = x >> (64 - self.precision)
+        rest_bits = 64 - self.precision
+        rest = x & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def relative_error(self) -> float:
+        # standard error of the estimate
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def count(self) -> int:
+        m = len(self.registers)
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        # small range correction (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+
+class KLLSketch:
+    """
+    Karnin-Lang-Liberty quantile sketch: a stack of compactors, where the
+    items on level h each stand for 2 ** h of the values added.
+    """
+
+    def __init__(self, k=200, seed=None):
+        if not isinstance(k, int) or k < 8:
+            raise ValueError("Argument k must be an int of at least 8")
+
+        self.k = k
+        self.count = 0
+        self.compactors = [[]]
+        self.__random = random.Random(seed)
+        self.__size = 0
+        self.__max_size = self._capacity(0)
+
+    def _capacity(self, level) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil((2 / 3) ** depth * self.k)) + 1
+
+    def _grow(self):
+        self.compactors.append([])
+        self.__max_size = sum(
+            self._capacity(h) for h in range(len(self.compactors))
+        )
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            compactor = self.compactors[level]
+            if len(compactor) < self._capacity(level):
+                continue
+
+            if level + 1 == len(self.compactors):
+                self._grow()
+
+            # keep every other item of the sorted level, from a random start
+            compactor.sort()
+            leftover = compactor.pop() if len(compactor) % 2 else None
+            offset = self.__random.randint(0, 1)
+            self.compactors[level + 1].extend(compactor[offset::2])
+            compactor.clear()
+            if leftover is not None:
+                compactor.append(leftover)
+
+            self.__size = sum(len(c) for c in self.compactors)
+            if self.__size < self.__max_size:
+                break
+
+    def add(self, value):
+        self.compactors[0].append(value)
+        self.count += 1
+        self.__size += 1
+        if self.__size >= self.__max_size:
+            self._compress()
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        if other.k != self.k:
+            raise ValueError("Cannot merge sketches with different k")
+
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+
+        self.count += other.count
+        self.__size = sum(len(c) for c in self.compactors)
+        while self.__size >= self.__max_size:
+            self._compress()
+
+    def rank_error(self) -> float:
+        # normalized rank error, empirical fit published for KLL sketches
+        return 2.296 / self.k ** 0.9723
+
+    def quantile(self, q) -> float:
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            raise ValueError("Sketch is empty")
+
+        weighted = sorted(
+            (value, 1 << level)
+            for level, compactor in enumerate(self.compactors)
+            for value in compactor
+        )
+
+        target = q * self.count
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+
+        return weighted[-1][0]
@@ -0,0 +1,221 @@
+"""
+This file contains the binary snapshot format behind Comma.save_snapshot()
+and Comma.open_snapshot().
+
+Layout: a fixed file header (magic and format version), one block per
+column, then a JSON footer holding the header, row count and the offset
+table (kind, offset, length and crc32 of every column block), followed by
+the footer length, the footer crc32 and the magic again. Files are read
+through mmap, so only the blocks of the requested columns are touched.
+
+Column blocks, in the byte order recorded in the footer:
+    int       array('q') values
+    float     array('d') values, then one array('b') integral flag per row
+    str       array('q') of rows + 1 char offsets, then the utf-8 text
+    category  array('i') codes, then the categories laid out like str
+"""
+import array
+import json
+import mmap
+import struct
+import sys
+import zlib
+
+from .storage import (
+    ColumnStore,
+    _infer_column,
+    _IntColumn,
+    _FloatColumn,
+    _StrColumn,
+    _CategoryColumn
+)
+
+MAGIC = b"PYCOMMA\x00"
+VERSION = 1
+
+_FILE_HEADER = struct.Struct("<8sI")
+_FOOTER_TAIL = struct.Struct("<QI8s")
+
+
+def _encode_text(values) -> bytes:
+    offsets = array.array("q", [0])
+    position = 0
+    for value in values:
+        position += len(value)
+        offsets.append(position)
+
+    return offsets.tobytes() + "".join(values).encode("utf-8")
+
+
+def _decode_text(buffer, count, swap) -> list:
+    offsets = array.array("q")
+    offsets.frombytes(buffer[:8 * (count + 1)])
+    if swap:
+        offsets.byteswap()
+
+    text = bytes(buffer[8 * (count + 1):]).decode("utf-8")
+    return [text[offsets[i]:offsets[i + 1]] for i in range(count)]
+
+
+def _encode_column(column) -> tuple:
+    # returns (kind, block, extra footer fields)
+    if isinstance(column, _IntColumn):
+        return "int", column.values.tobytes(), {}
+    if isinstance(column, _FloatColumn):
+        return "float", column.values.tobytes() + column.integral.tobytes(), {}
+    if isinstance(column, _CategoryColumn):
+        block = column.codes.tobytes() + _encode_text(column.categories)
+        return "category", block, {"categories": len(column.categories)}
+    return "str", _encode_text(column.to_list()), {}
+
+
+def _decode_column(buffer, entry, rows, swap):
+    kind = entry["kind"]
+
+    if kind == "int":
+        column = _IntColumn()
+        column.values.frombytes(buffer)
+        if swap:
+            column.values.byteswap()
+        return column
+
+    if kind == "float":
+        column = _FloatColumn()
+        column.values.frombytes(buffer[:8 * rows])
+        column.integral.frombytes(buffer[8 * rows:])
+        if swap:
+            column.values.byteswap()
+        return column
+
+    if kind == "category":
+        column = _CategoryColumn()
+        column.codes.frombytes(buffer[:4 * rows])
+        if swap:
+            column.codes.byteswap()
+        categories = _decode_text(buffer[4 * rows:], entry["categories"], swap)
+        column.categories = categories
+        column.lookup = {value: code for code, value in enumerate(categories)}
+        return column
+
+    return _StrColumn(_decode_text(buffer, rows, swap))
+
+
+def write(path, header, store, source=None):
+    # store is a RowStore or a ColumnStore, source describes the csv file
+    # the data was parsed from, when it is an unmodified copy of it
+    if isinstance(store, ColumnStore):
+        columns = store.parts()
+    else:
+        columns = None
+
+    entries = []
+    with open(path, mode="wb") as snapshot_file:
+        snapshot_file.write(_FILE_HEADER.pack(MAGIC, VERSION))
+
+        for column_idx in range(len(header)):
+            if columns is not None:
+                column = columns[column_idx]
+            else:
+                # row storage keeps cells as they were added, ints included
+                values = [str(v) for v in store.column(column_idx)]
+                column = _infer_column(values)
+
+            kind, block, extra = _encode_column(column)
+            entry = {
+                "name": header[column_idx],
+                "kind": kind,
+                "offset": snapshot_file.tell(),
+                "length": len(block),
+                "crc32": zlib.crc32(block)
+            }
+            entry.update(extra)
+            entries.append(entry)
+            snapshot_file.write(block)
+
+        footer = json.dumps({
+            "header": list(header),
+            "rows": len(store),
+            "byteorder": sys.byteorder,
+            "columns": entries,
+            "source": source
+        }).encode("utf-8")
+
+        snapshot_file.write(footer)
+        snapshot_file.write(
+            _FOOTER_TAIL.pack(len(footer), zlib.crc32(footer), MAGIC)
+        )
+
+
+def _read_footer(snapshot_map) -> dict:
+    size = len(snapshot_map)
+    if size < _FILE_HEADER.size + _FOOTER_TAIL.size:
+        raise ValueError("File is not a pycomma snapshot")
+
+    magic, version = _FILE_HEADER.unpack_from(snapshot_map, 0)
+    footer_length, footer_crc, tail_magic = _FOOTER_TAIL.unpack_from(
+        snapshot_map,
+        size - _FOOTER_TAIL.size
+    )
+    if magic != MAGIC or tail_magic != MAGIC:
+        raise ValueError("File is not a pycomma snapshot")
+    if version != VERSION:
+        raise ValueError("Unsupported snapshot version " + str(version))
+
+    footer_end = size - _FOOTER_TAIL.size
+    footer = snapshot_map[footer_end - footer_length:footer_end]
+    if zlib.crc32(footer) != footer_crc:
+        raise ValueError("Snapshot footer checksum mismatch")
+
+    return json.loads(footer.decode("utf-8"))
+
+
+def _open_map(path):
+    with open(path, mode="rb") as snapshot_file:
+        return mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_footer(path) -> dict:
+    snapshot_map = _open_map(path)
+    try:
+        return _read_footer(snapshot_map)
+    finally:
+        snapshot_map.close()
+
+
+def read(path, columns=None) -> tuple:
+    # returns (footer, header, ColumnStore) holding only the given columns
+    snapshot_map = _open_map(path)
+    try:
+        footer = _read_footer(snapshot_map)
+        entries = {entry["name"]: entry for entry in footer["columns"]}
+
+        if columns is None:
+            columns = footer["header"]
+        for column_name in columns:
+            if column_name not in entries:
+                msg = "Column " + str(column_name) + " does not exist"
+                raise ValueError(msg)
+
+        rows = footer["rows"]
+        swap = footer["byteorder"] != sys.byteorder
+        view = memoryview(snapshot_map)
+        try:
+            parts = []
+            for column_name in columns:
+                entry = entries[column_name]
+                start = entry["offset"]
+                block = view[start:start + entry["length"]]
+                if zlib.crc32(block) != entry["crc32"]:
+                    block.release()
+                    msg = "Snapshot checksum mismatch in column "
+                    msg += str(column_name)
+                    raise ValueError(msg)
+
+                parts.append(_decode_column(block, entry, rows, swap))
+                block.release()
+        finally:
+            view.release()
+    finally:
+        snapshot_map.close()
+
+    return footer, list(columns), ColumnStore.from_parts(parts, rows)
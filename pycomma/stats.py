@@ -0,0 +1,385 @@
+"""
+This file contains the statistic helpers used by class Comma.
+"""
+import bisect
+import math
+import random
+import statistics
+
+
+class RunningStats:
+    """
+    Count, sum, minimum, maximum and Welford moments of a stream of floats,
+    updated one value at a time.
+    """
+
+    def __init__(self, values=()):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        self.extend(values)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+        delta = value - self.__mean
+        self.__mean += delta / self.count
+        self.__m2 += delta * (value - self.__mean)
+
+    def extend(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        # Chan et al. pairwise update, so partial results can be combined
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.total = other.total
+            self.minimum = other.minimum
+            self.maximum = other.maximum
+            self.__mean = other.__mean
+            self.__m2 = other.__m2
+            return
+
+        count = self.count + other.count
+        delta = other.__mean - self.__mean
+        self.__mean += delta * other.count / count
+        self.__m2 += other.__m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def mean(self) -> float:
+        if self.count < 1:
+            msg = "mean requires at least one data point"
+            raise statistics.StatisticsError(msg)
+        # the Welford mean drifts from sum / count, it only feeds __m2
+        return self.total / self.count
+
+    def variance(self) -> float:
+        # sample variance, like statistics.variance
+        if self.count < 2:
+            msg = "variance requires at least two data points"
+            raise statistics.StatisticsError(msg)
+        return self.__m2 / (self.count - 1)
+
+    def stdev(self) -> float:
+        return math.sqrt(self.variance())
+
+
+class TrackedStats:
+    """
+    Live statistics of one column, kept up to date as values are added and
+    removed. Values that are not numbers are only counted, in na_count.
+    """
+
+    def __init__(self, values=()):
+        self.count = 0
+        self.total = 0
+        self.na_count = 0
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        # sorted numbers, for the median, minimum and maximum
+        self.__sorted = []
+        self.extend(values)
+
+    def add(self, value):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            self.na_count += 1
+            return
+
+        self.count += 1
+        self.total += value
+        delta = value - self.__mean
+        self.__mean += delta / self.count
+        self.__m2 += delta * (value - self.__mean)
+        bisect.insort(self.__sorted, value)
+
+    def extend(self, values):
+        for value in values:
+            self.add(value)
+
+    def remove(self, value):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            self.na_count -= 1
+            return
+
+        self.__sorted.pop(bisect.bisect_left(self.__sorted, value))
+        self.count -= 1
+        self.total -= value
+        if self.count == 0:
+            self.total = 0
+            self.__mean = 0.0
+            self.__m2 = 0.0
+            return
+
+        # Welford update run backwards
+        delta = value - self.__mean
+        self.__mean -= delta / self.count
+        self.__m2 = max(self.__m2 - delta * (value - self.__mean), 0.0)
+
+    def minimum(self) -> float:
+        if not self.__sorted:
+            raise ValueError("min() arg is an empty sequence")
+        return self.__sorted[0]
+
+    def maximum(self) -> float:
+        if not self.__sorted:
+            raise ValueError("max() arg is an empty sequence")
+        return self.__sorted[-1]
+
+    def mean(self) -> float:
+        if self.count < 1:
+            msg = "mean requires at least one data point"
+            raise statistics.StatisticsError(msg)
+        return self.total / self.count
+
+    def variance(self) -> float:
+        if self.count < 2:
+            msg = "variance requires at least two data points"
+            raise statistics.StatisticsError(msg)
+        return self.__m2 / (self.count - 1)
+
+    def stdev(self) -> float:
+        return math.sqrt(self.variance())
+
+    def median(self) -> float:
+        n = len(self.__sorted)
+        if n == 0:
+            raise statistics.StatisticsError("no median for empty data")
+        if n % 2 == 1:
+            return self.__sorted[n // 2]
+        return (self.__sorted[n // 2 - 1] + self.__sorted[n // 2]) / 2
+
+
+class Reservoir:
+    """
+    Uniform random sample of a stream of unknown length, by Li's Algorithm
+    L: after the first size items, a random number of items is skipped
+    between replacements instead of drawing a number for every item.
+    """
+
+    def __init__(self, size, seed=None):
+        self.size = size
+        self.seen = 0
+        self.__random = random.Random(seed)
+        # (stream position, item) pairs
+        self.__items = []
+        self.__w = math.exp(math.log(self._uniform()) / size)
+        self.__next = size - 1
+        self._skip()
+
+    def _uniform(self) -> float:
+        # in (0, 1), so that its log is defined
+        value = self.__random.random()
+        while value == 0.0:
+            value = self.__random.random()
+        return value
+
+    def _skip(self):
+        self.__next += math.floor(
+            math.log(self._uniform()) / math.log(1 - self.__w)
+        ) + 1
+
+    def extend(self, items):
+        start = self.seen
+        self.seen += len(items)
+
+        missing = self.size - len(self.__items)
+        if missing > 0:
+            self.__items.extend(
+                (start + i, items[i]) for i in range(min(missing, len(items)))
+            )
+
+        while self.__next < self.seen:
+            slot = self.__random.randrange(self.size)
+            self.__items[slot] = (self.__next, items[self.__next - start])
+            self.__w *= math.exp(math.log(self._uniform()) / self.size)
+            self._skip()
+
+    def items(self) -> list:
+        # in stream order
+        return [item for position, item in sorted(self.__items, key=_first)]
+
+
+def _first(pair):
+    return pair[0]
+
+
+def select(values, k):
+    # k-th smallest value (0-based) by quickselect, values is left untouched
+    if not 0 <= k < len(values):
+        raise IndexError("Selection index out of range")
+
+    while True:
+        pivot = values[random.randrange(len(values))]
+        lows = [v for v in values if v < pivot]
+
+        if k < len(lows):
+            values = lows
+            continue
+
+        k -= len(lows)
+        pivot_count = sum(1 for v in values if v == pivot)
+        if k < pivot_count:
+            return pivot
+
+        k -= pivot_count
+        values = [v for v in values if v > pivot]
+
+
+def median(values) -> float:
+    n = len(values)
+    if n == 0:
+        raise statistics.StatisticsError("no median for empty data")
+
+    if n % 2 == 1:
+        return select(values, n // 2)
+
+    lower = select(values, n // 2 - 1)
+    # the upper middle is either another copy of lower or the next value up
+    if sum(1 for v in values if v <= lower) > n // 2:
+        return lower
+    upper = min(v for v in values if v > lower)
+    return (lower + upper) / 2
+
+
+def quantile(sorted_values, q) -> float:
+    # linear interpolation between the two closest ranks
+    if not sorted_values:
+        raise statistics.StatisticsError("no quantile for empty data")
+    if not 0 <= q <= 1:
+        raise ValueError("Quantile must be between 0 and 1")
+
+    position = q * (len(sorted_values) - 1)
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    fraction = position - lower
+
+    return sorted_values[lower] + \
+        (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def summarize(values, quantiles=()) -> dict:
+    # values may be str or numbers, the ones that are not numbers are left
+    # out; statistics without enough data points are None
+    numbers = []
+    for value in values:
+        try:
+            numbers.append(float(value))
+        except (TypeError, ValueError):
+            pass
+
+    running = RunningStats(numbers)
+    numbers.sort()
+
+    summary = {
+        "count": running.count,
+        "mean": None,
+        "stdev": None,
+        "minimum": running.minimum,
+        "median": None,
+        "maximum": running.maximum,
+        "quantiles": [None] * len(quantiles)
+    }
+
+    if numbers:
+        summary["mean"] = running.mean()
+        summary["median"] = quantile(numbers, 0.5)
+        summary["quantiles"] = [quantile(numbers, q) for q in quantiles]
+    if running.count > 1:
+        summary["stdev"] = running.stdev()
+
+    return summary
+
+
+AGGREGATIONS = ("sum", "mean", "count", "min", "max")
+
+
+def aggregation_spec(aggregations) -> dict:
+    # {"col": "sum"} or {"col": ["sum", "mean"]} -> {"col": ["sum", ...]}
+    if not isinstance(aggregations, dict):
+        raise ValueError("Argument aggregations must be a dict")
+
+    spec = {}
+    for column_name, names in aggregations.items():
+        if isinstance(names, str):
+            names = [names]
+        for name in names:
+            if name not in AGGREGATIONS:
+                msg = "Aggregation must be one of " + ", ".join(AGGREGATIONS)
+                raise ValueError(msg)
+        spec[str(column_name)] = list(names)
+
+    return spec
+
+
+def aggregation_header(spec) -> list:
+    return [
+        column_name + "_" + name
+        for column_name, names in spec.items()
+        for name in names
+    ]
+
+
+def format_value(value) -> str:
+    # aggregation results as cells, None (no data) becomes an empty cell
+    if value is None:
+        return ""
+    return str(value)
+
+
+class Aggregate:
+    """
+    Accumulates one column for the aggregations in AGGREGATIONS. count is
+    the number of rows seen, the other results skip non-numeric values.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.numbers = RunningStats()
+
+    def add(self, value):
+        self.rows += 1
+        try:
+            self.numbers.add(float(value))
+        except ValueError:
+            pass
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.numbers.merge(other.numbers)
+
+    def result(self, aggregation):
+        if aggregation == "count":
+            return self.rows
+
+        if self.numbers.count == 0:
+            return None
+
+        if aggregation == "sum":
+            return self.numbers.total
+        if aggregation == "mean":
+            return self.numbers.mean()
+        if aggregation == "min":
+            return self.numbers.minimum
+        if aggregation == "max":
+            return self.numbers.maximum
+
+        raise ValueError("Unknown aggregation " + str(aggregation))
@@ -0,0 +1,493 @@
+"""
+This file contains the storage backends used by class Comma. RowStore keeps
+the data as a list of rows, ColumnStore keeps every column in its own
+type-specialized container. Both expose the same interface so that Comma
+can work against either one.
+"""
+import array
+import collections
+
+_INT_MIN = -(2 ** 63)
+_INT_MAX = 2 ** 63 - 1
+_FLOAT_EXACT_INT = 2 ** 53
+# rows per block when iterating over a ColumnStore
+_ITER_ROWS = 4096
+
+
+def _as_int(value):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+
+    if str(number) != value or not _INT_MIN <= number <= _INT_MAX:
+        return None
+
+    return number
+
+
+def _as_float(value):
+    # returns (number, integral) or None when value does not round-trip
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+
+    if repr(number) == value:
+        return number, False
+
+    number = _as_int(value)
+    if number is not None and abs(number) <= _FLOAT_EXACT_INT:
+        return float(number), True
+
+    return None
+
+
+class _IntColumn:
+    def __init__(self, values=()):
+        self.values = array.array("q", values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, idx) -> str:
+        return str(self.values[idx])
+
+    def extend(self, values) -> bool:
+        numbers = []
+        for value in values:
+            number = _as_int(value)
+            if number is None:
+                return False
+            numbers.append(number)
+
+        self.values.extend(numbers)
+        return True
+
+    def pop(self, idx) -> str:
+        return str(self.values.pop(idx))
+
+    def to_list(self, start=0, end=None) -> list:
+        return list(map(str, self.values[start:end]))
+
+    def take(self, row_indices):
+        values = self.values
+        return _IntColumn(values[i] for i in row_indices)
+
+    def numeric(self):
+        return self.values
+
+
+class _FloatColumn:
+    def __init__(self, values=(), integral=()):
+        self.values = array.array("d", values)
+        # one flag per cell so that "67" is written back as "67", not "67.0"
+        self.integral = array.array("b", integral)
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, idx) -> str:
+        if self.integral[idx]:
+            return str(int(self.values[idx]))
+        return repr(self.values[idx])
+
+    def extend(self, values) -> bool:
+        numbers = []
+        integral = []
+        for value in values:
+            parsed = _as_float(value)
+            if parsed is None:
+                return False
+            numbers.append(parsed[0])
+            integral.append(parsed[1])
+
+        self.values.extend(numbers)
+        self.integral.extend(integral)
+        return True
+
+    def pop(self, idx) -> str:
+        value = self.get(idx)
+        self.values.pop(idx)
+        self.integral.pop(idx)
+        return value
+
+    def to_list(self, start=0, end=None) -> list:
+        values = self.values[start:end]
+        integral = self.integral[start:end]
+        return [
+            str(int(v)) if flag else repr(v)
+            for v, flag in zip(values, integral)
+        ]
+
+    def take(self, row_indices):
+        values = self.values
+        integral = self.integral
+        return _FloatColumn(
+            (values[i] for i in row_indices),
+            (integral[i] for i in row_indices)
+        )
+
+    def numeric(self):
+        return self.values
+
+
+class _StrColumn:
+    def __init__(self, values=()):
+        # repeated values share a single str object
+        pool = {}
+        self.values = [pool.setdefault(v, v) for v in values]
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, idx) -> str:
+        return self.values[idx]
+
+    def extend(self, values) -> bool:
+        pool = {}
+        self.values.extend(pool.setdefault(v, v) for v in values)
+        return True
+
+    def pop(self, idx) -> str:
+        return self.values.pop(idx)
+
+    def to_list(self, start=0, end=None) -> list:
+        return self.values[start:end]
+
+    def take(self, row_indices):
+        column = _StrColumn()
+        values = self.values
+        column.values = [values[i] for i in row_indices]
+        return column
+
+    def numeric(self):
+        return None
+
+
+class _CategoryColumn:
+    """
+    Dictionary-encoded text: one int code per cell plus the list of
+    distinct values, in order of first appearance.
+    """
+
+    def __init__(self, values=()):
+        self.categories = []
+        self.lookup = {}
+        self.codes = array.array("i")
+        self.extend(values)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _code(self, value) -> int:
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self.lookup[value] = code
+        return code
+
+    def get(self, idx) -> str:
+        return self.categories[self.codes[idx]]
+
+    def extend(self, values) -> bool:
+        code = self._code
+        self.codes.extend([code(v) for v in values])
+        return True
+
+    def pop(self, idx) -> str:
+        return self.categories[self.codes.pop(idx)]
+
+    def to_list(self, start=0, end=None) -> list:
+        categories = self.categories
+        return [categories[c] for c in self.codes[start:end]]
+
+    def take(self, row_indices):
+        column = _CategoryColumn()
+        column.categories = list(self.categories)
+        column.lookup = dict(self.lookup)
+        codes = self.codes
+        column.codes = array.array("i", [codes[i] for i in row_indices])
+        return column
+
+    def numeric(self):
+        return None
+
+    def counts(self) -> dict:
+        counts = collections.Counter(self.codes)
+
+        # report values in order of first appearance, like a row scan would
+        ordered = {}
+        for code in self.codes:
+            if code not in ordered:
+                ordered[code] = counts[code]
+                if len(ordered) == len(counts):
+                    break
+
+        categories = self.categories
+        return {categories[code]: count for code, count in ordered.items()}
+
+    def map_categories(self, fn):
+        # rewrites the dictionary; codes only change when values merge
+        categories = []
+        lookup = {}
+        remap = []
+        for value in self.categories:
+            value = fn(value)
+            code = lookup.get(value)
+            if code is None:
+                code = len(categories)
+                categories.append(value)
+                lookup[value] = code
+            remap.append(code)
+
+        if len(categories) != len(self.categories):
+            self.codes = array.array("i", [remap[c] for c in self.codes])
+
+        self.categories = categories
+        self.lookup = lookup
+
+
+def _infer_column(values):
+    ints = []
+    for value in values:
+        number = _as_int(value)
+        if number is None:
+            break
+        ints.append(number)
+    else:
+        return _IntColumn(ints)
+
+    floats = []
+    integral = []
+    for value in values:
+        parsed = _as_float(value)
+        if parsed is None:
+            break
+        floats.append(parsed[0])
+        integral.append(parsed[1])
+    else:
+        return _FloatColumn(floats, integral)
+
+    return _StrColumn(values)
+
+
+class RowStore(list):
+    """
+    Row-oriented storage: a list of rows, each row a list of str.
+    """
+
+    def column(self, column_idx) -> list:
+        return [row[column_idx] for row in self]
+
+    def set_column(self, column_idx, values):
+        for row, value in zip(self, values):
+            row[column_idx] = value
+
+    def append_column(self, values):
+        for row, value in zip(self, values):
+            row.append(value)
+
+    def delete_column(self, column_idx):
+        for row in self:
+            row.pop(column_idx)
+
+    def reorder_columns(self, column_indices):
+        for i in range(len(self)):
+            row = self[i]
+            self[i] = [row[j] for j in column_indices]
+
+    def take(self, row_indices):
+        return RowStore([self[i] for i in row_indices])
+
+    def numeric(self, column_idx):
+        return None
+
+    def categories(self, column_idx):
+        return None
+
+    def category_codes(self, column_idx):
+        return None
+
+
+class ColumnStore:
+    """
+    Column-oriented storage. Integer columns live in array('q'), other
+    numeric columns in array('d') and text columns in a deduplicated list
+    of str. Cells are always read and written as str.
+    """
+
+    def __init__(self, width=0):
+        self.__columns = [_IntColumn() for _ in range(width)]
+        self.__length = 0
+
+    @classmethod
+    def from_rows(cls, rows, width):
+        store = cls(width)
+        store.extend(rows)
+        return store
+
+    @classmethod
+    def from_parts(cls, columns, length):
+        # columns are ready-made column containers, as returned by parts()
+        store = cls()
+        store.__columns = list(columns)
+        store.__length = length
+        return store
+
+    @classmethod
+    def from_columns(cls, columns):
+        # columns are lists of str, or column containers as returned by
+        # parts() that are used as they are
+        store = cls(len(columns))
+        store.__columns = [
+            _infer_column(column) if isinstance(column, list) else column
+            for column in columns
+        ]
+        store.__length = len(columns[0]) if columns else 0
+        return store
+
+    def __len__(self):
+        return self.__length
+
+    def __iter__(self):
+        # rows are built one block at a time, so a full scan holds at most
+        # _ITER_ROWS rows of str values
+        for start in range(0, self.__length, _ITER_ROWS):
+            end = min(start + _ITER_ROWS, self.__length)
+            if not self.__columns:
+                yield from ([] for _ in range(end - start))
+                continue
+
+            blocks = [column.to_list(start, end) for column in self.__columns]
+            for row in zip(*blocks):
+                yield list(row)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            indices = range(*idx.indices(self.__length))
+            return [self.row(i) for i in indices]
+        return self.row(idx)
+
+    def _normalize(self, row_idx) -> int:
+        if row_idx < 0:
+            row_idx += self.__length
+        if not 0 <= row_idx < self.__length:
+            raise IndexError("Row index out of range")
+        return row_idx
+
+    def _extend_column(self, column_idx, values):
+        column = self.__columns[column_idx]
+        if not column.extend(values):
+            values = column.to_list() + values
+            self.__columns[column_idx] = _infer_column(values)
+
+    def row(self, row_idx) -> list:
+        row_idx = self._normalize(row_idx)
+        return [column.get(row_idx) for column in self.__columns]
+
+    def append(self, row):
+        self.extend([row])
+
+    def extend(self, rows):
+        rows = list(rows)
+        width = len(self.__columns)
+        for i, row in enumerate(rows):
+            if len(row) != width:
+                msg = "Row " + str(self.__length + i) + " has " + str(len(row))
+                msg += " values, the number of columns is " + str(width)
+                raise ValueError(msg)
+
+        if not rows:
+            return
+
+        for j, values in enumerate(zip(*rows)):
+            self._extend_column(j, [str(v) for v in values])
+        self.__length += len(rows)
+
+    def pop(self, row_idx=-1) -> list:
+        row_idx = self._normalize(row_idx)
+        row = [column.pop(row_idx) for column in self.__columns]
+        self.__length -= 1
+        return row
+
+    def column(self, column_idx) -> list:
+        return self.__columns[column_idx].to_list()
+
+    def parts(self) -> list:
+        return list(self.__columns)
+
+    def set_column(self, column_idx, values):
+        values = [str(v) for v in values]
+        # categorical columns stay encoded through column rewrites
+        if isinstance(self.__columns[column_idx], _CategoryColumn):
+            self.__columns[column_idx] = _CategoryColumn(values)
+        else:
+            self.__columns[column_idx] = _infer_column(values)
+
+    def append_column(self, values):
+        if len(values) != self.__length:
+            raise ValueError("Length of data does not match number of rows")
+        self.__columns.append(_infer_column([str(v) for v in values]))
+
+    def delete_column(self, column_idx):
+        self.__columns.pop(column_idx)
+
+    def reorder_columns(self, column_indices):
+        self.__columns = [self.__columns[j] for j in column_indices]
+
+    def take(self, row_indices):
+        row_indices = list(row_indices)
+        store = ColumnStore()
+        store.__columns = [c.take(row_indices) for c in self.__columns]
+        store.__length = len(row_indices)
+        return store
+
+    def numeric(self, column_idx):
+        return self.__columns[column_idx].numeric()
+
+    def column_kind(self, column_idx) -> str:
+        column = self.__columns[column_idx]
+        if isinstance(column, _IntColumn):
+            return "int"
+        if isinstance(column, _FloatColumn):
+            return "float"
+        if isinstance(column, _CategoryColumn):
+            return "category"
+        return "str"
+
+    def encode_categorical(self, column_idx):
+        column = self.__columns[column_idx]
+        if not isinstance(column, _CategoryColumn):
+            self.__columns[column_idx] = _CategoryColumn(column.to_list())
+
+    def decode_categorical(self, column_idx):
+        column = self.__columns[column_idx]
+        if isinstance(column, _CategoryColumn):
+            self.__columns[column_idx] = _infer_column(column.to_list())
+
+    def low_cardinality(self, column_idx, max_share) -> bool:
+        # text columns whose distinct values are at most max_share of rows
+        column = self.__columns[column_idx]
+        if not isinstance(column, _StrColumn) or not len(column):
+            return False
+        return len(set(column.values)) <= max_share * len(column)
+
+    def categories(self, column_idx):
+        column = self.__columns[column_idx]
+        if isinstance(column, _CategoryColumn):
+            return column.categories
+        return None
+
+    def category_codes(self, column_idx):
+        column = self.__columns[column_idx]
+        if isinstance(column, _CategoryColumn):
+            return column.codes
+        return None
+
+    def category_counts(self, column_idx) -> dict:
+        return self.__columns[column_idx].counts()
+
+    def map_categories(self, column_idx, fn):
+        self.__columns[column_idx].map_categories(fn)
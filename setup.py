@@ -18,6 +18,9 @@ setup(
     license='MIT',
     packages=['pycomma'],
     install_requires=[],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
@@ -0,0 +1,35 @@
+"""
+This file contains the fixtures shared by the tests of class Comma.
+"""
+from ..pycomma.comma import Comma
+import pytest
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture
+def sample_path() -> str:
+    return os.path.join(current_dir, "test_data_sample.csv")
+
+@pytest.fixture
+def with_header_path() -> str:
+    return os.path.join(current_dir, "test_data_with_header.csv")
+
+@pytest.fixture
+def prepared(sample_path):
+    # builds a quiet, prepared Comma of the sample file by default
+    def build(
+        path=None, 
+        storage="rows", 
+        engine="fast", 
+        use_numpy=None, 
+        **kwargs
+    ):
+        comma = Comma(path or sample_path, storage=storage, engine=engine)
+        comma.set_config("success_messages", False)
+        if use_numpy is not None:
+            comma.set_config("use_numpy", use_numpy)
+        comma.prepare(**kwargs)
+        return comma
+
+    return build
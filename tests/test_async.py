@@ -0,0 +1,73 @@
+"""
+This file contains tests for the asyncio functions within class Comma.
+"""
+from ..pycomma.comma import Comma
+import pytest
+import asyncio
+import json
+
+def test_aprepare_and_async_exports(tmp_path, sample_path):
+    csv_path = str(tmp_path / "out.csv")
+    json_path = str(tmp_path / "out.json")
+
+    async def run():
+        comma = Comma(sample_path)
+        comma.set_config("success_messages", False)
+        await comma.aprepare(usecols=["id", "gender"])
+        await asyncio.gather(
+            comma.asave_as_csv(csv_path),
+            comma.asave_as_json(json_path, use_wrapper=False)
+        )
+        return comma
+
+    comma = asyncio.run(run())
+    assert comma.get_header() == ["id", "gender"]
+
+    with open(csv_path, mode="r", encoding="utf-8") as csv_file:
+        assert csv_file.readline() == "id,gender\n"
+    with open(json_path, mode="r", encoding="utf-8") as json_file:
+        assert len(json.load(json_file)) == 20
+
+def test_aload_many_yields_every_path(sample_path, with_header_path):
+    paths = [sample_path, with_header_path] * 3
+
+    async def run():
+        results = []
+        async for path, comma in Comma.aload_many(paths, concurrency=2):
+            results.append((path, len(comma.get_data())))
+        return results
+
+    row_counts = {}
+    for path in set(paths):
+        with open(path, mode="r", encoding="utf-8") as csv_file:
+            row_counts[path] = len(csv_file.readlines()) - 1
+
+    results = asyncio.run(run())
+    assert sorted(results) == sorted((path, row_counts[path]) for path in paths)
+
+def test_aload_many_errors(tmp_path, sample_path):
+    missing = str(tmp_path / "missing.csv")
+
+    async def run(return_exceptions):
+        results = []
+        async for path, result in Comma.aload_many(
+            [sample_path, missing],
+            return_exceptions=return_exceptions,
+            prepare_options={"head": 3}
+        ):
+            results.append((path, result))
+        return results
+
+    results = dict(asyncio.run(run(True)))
+    assert isinstance(results[missing], FileNotFoundError)
+    assert len(results[sample_path].get_data()) == 3
+
+    with pytest.raises(FileNotFoundError) as excinfo:
+        asyncio.run(run(False))
+
+def test_prepare_is_quiet_without_success_messages(capsys, sample_path):
+    comma = Comma(sample_path)
+    comma.set_config("success_messages", False)
+    comma.prepare()
+
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,52 @@
+"""
+This file contains tests for the compute backends within class Comma.
+The NumPy tests are skipped when NumPy is not installed.
+"""
+from ..pycomma.comma import Comma
+import pytest
+
+def test_set_config_use_numpy_non_bool_value_type(sample_path):
+    comma = Comma(sample_path)
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.set_config("use_numpy", 1)
+
+def test_filter_rows_numeric_and_text(prepared):
+    comma = prepared(use_numpy=False)
+    assert comma.filter_rows("age", ">=", 80) == [2, 5, 10]
+    assert comma.filter_rows("gender", "==", "Male") == \
+        comma.find_by("gender", "Male")
+    assert comma.filter_rows("bmi", "==", "N/A") == [1, 8, 13, 19]
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.filter_rows("age", "~", 1)
+
+def test_filter_rows_numeric_with_na(prepared):
+    comma = prepared(use_numpy=False)
+    bmis = comma.column_values("bmi")
+    expected = [
+        i for i in range(len(bmis)) if bmis[i] != "N/A" and float(bmis[i]) > 30
+    ]
+
+    assert comma.filter_rows("bmi", ">", 30) == expected
+    assert len(comma.filter_rows("bmi", ">", 5)) == 16
+    assert comma.filter_rows("bmi", "<", 5) == []
+
+def test_numpy_backend_matches_python(prepared):
+    pytest.importorskip("numpy")
+    python = prepared(use_numpy=False)
+    vectorized = prepared(use_numpy=True)
+
+    for column in ("age", "avg_glucose_level"):
+        assert vectorized.sum(column) == pytest.approx(python.sum(column))
+        assert vectorized.mean(column) == pytest.approx(python.mean(column))
+        assert vectorized.median(column) == python.median(column)
+        assert vectorized.stdev(column) == pytest.approx(python.stdev(column))
+        assert vectorized.minimum(column) == python.minimum(column)
+        assert vectorized.maximum(column) == python.maximum(column)
+        assert vectorized.filter_rows(column, "<", 70) == \
+            python.filter_rows(column, "<", 70)
+
+    python.sort_by_column("age", reverse=True)
+    vectorized.sort_by_column("age", reverse=True)
+    assert list(vectorized.get_data()) == list(python.get_data())
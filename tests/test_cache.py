@@ -0,0 +1,53 @@
+"""
+This file contains tests for the column cache within class Comma. Every
+test checks that a cached result is dropped once its column changes.
+"""
+import pytest
+
+def test_value_counts_returns_copy(prepared):
+    comma = prepared()
+    counts = comma.value_counts("gender")
+    counts["Male"] = 0
+    assert comma.value_counts("gender")["Male"] == 8
+
+def test_cache_follows_column_mutations(prepared):
+    comma = prepared()
+    assert comma.sum("hypertension") == 5
+
+    comma.change("hypertension", "1", "2")
+    assert comma.sum("hypertension") == 10
+
+    comma.replace("gender", "female", "f")
+    assert comma.value_counts("gender") == {"Male": 8, "f": 12}
+
+    comma.fill_empty("bmi", "0")
+    with pytest.raises(ValueError) as excinfo:
+        comma.sum("bmi")
+
+    comma.change("bmi", "N/A", "0")
+    assert comma.minimum("bmi") == 0
+
+def test_cache_follows_row_mutations(prepared):
+    comma = prepared()
+    assert comma.maximum("age") == 81
+
+    comma.add_row(["1", "Male", "99"] + ["x"] * 9)
+    assert comma.maximum("age") == 99
+    assert comma.value_counts("gender")["Male"] == 9
+
+    comma.delete_rows([20])
+    assert comma.maximum("age") == 81
+
+    comma.sort_by_column("age")
+    assert comma.get(0, ["age"]) == {"age": "49"}
+    assert comma.unique_values("gender") == ["Female", "Male"]
+
+def test_cache_follows_column_names(prepared):
+    comma = prepared()
+    assert comma.sum("stroke") == 20
+
+    comma.change_column_name("stroke", "heart_disease_2")
+    comma.delete_column("heart_disease")
+    comma.add_column("stroke", [0] * 20)
+    assert comma.sum("stroke") == 0
+    assert comma.sum("heart_disease_2") == 20
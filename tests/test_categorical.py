@@ -0,0 +1,67 @@
+"""
+This file contains tests for the categorical columns of class Comma.
+"""
+import pytest
+
+def test_auto_detection_encodes_low_cardinality_text(prepared):
+    comma = prepared(storage="columnar", categorical="auto")
+    store = comma.get_data()
+    header = comma.get_header()
+
+    assert store.column_kind(header.index("gender")) == "category"
+    assert store.column_kind(header.index("work_type")) == "category"
+    assert store.column_kind(header.index("id")) == "int"
+    assert store.column_kind(header.index("bmi")) == "str"
+
+    # the encoded data reads back exactly like the plain one
+    assert list(store) == list(prepared().get_data())
+
+def test_categorical_requires_columnar_storage(prepared):
+    with pytest.raises(Exception) as excinfo:
+        prepared(storage="rows", categorical="auto")
+
+    comma = prepared(storage="rows")
+    with pytest.raises(Exception) as excinfo:
+        comma.encode_categorical("gender")
+
+def test_value_counts_and_filters_on_codes(prepared):
+    plain = prepared()
+    comma = prepared(
+        storage="columnar", 
+        categorical=["gender", "smoking_status"]
+    )
+
+    assert comma.value_counts("gender") == plain.value_counts("gender")
+    assert comma.unique_values("smoking_status") == \
+        plain.unique_values("smoking_status")
+    assert comma.find_by("gender", "Male") == plain.find_by("gender", "Male")
+    assert comma.find_by("gender", "Other") == []
+    assert comma.filter_rows("smoking_status", "!=", "smokes") == \
+        plain.filter_rows("smoking_status", "!=", "smokes")
+
+def test_change_rewrites_the_dictionary(prepared):
+    comma = prepared(storage="columnar", categorical=["gender"])
+    comma.change("gender", "male", "Female")
+
+    assert comma.value_counts("gender") == {"Female": 20}
+    assert comma.get_data().column_kind(1) == "category"
+
+    comma.change("gender", "Female", "F", case_matters=True)
+    assert comma.unique_values("gender") == ["F"]
+
+def test_mutations_keep_the_encoding(prepared):
+    comma = prepared(storage="columnar", categorical=["gender"])
+    comma.append("gender", "!")
+    comma.add_row(["1", "Other"] + ["x"] * 10)
+    comma.sort_by_column("age")
+
+    assert comma.value_counts("gender") == {
+        "Male!": 8, "Female!": 12, "Other": 1
+    }
+    assert comma.get_data().column_kind(1) == "category"
+
+    comma.decode_categorical("gender")
+    assert comma.get_data().column_kind(1) == "str"
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.decode_categorical("gender")
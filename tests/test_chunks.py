@@ -0,0 +1,46 @@
+"""
+This file contains tests for the streaming functions within class Comma.
+"""
+from ..pycomma.comma import Comma
+import pytest
+
+def test_iter_chunks_sizes(sample_path, prepared):
+    comma = Comma(sample_path)
+    chunks = list(comma.iter_chunks(rows=8))
+
+    assert [len(chunk) for chunk in chunks] == [8, 8, 4]
+    assert comma.get_header()[0] == "id"
+    assert chunks[0][0] == prepared().get_row_values(0)
+    assert comma.file_is_closed() == True
+
+def test_iter_chunks_invalid_rows(sample_path):
+    comma = Comma(sample_path)
+
+    with pytest.raises(ValueError) as excinfo:
+        next(comma.iter_chunks(rows=0))
+
+def test_stream_aggregates_match_prepared(sample_path, prepared):
+    comma = Comma(sample_path)
+    expected = prepared()
+
+    assert comma.stream_sum("age", rows=3) == expected.sum("age")
+    assert comma.stream_mean("bmi", ignore_na=True, rows=3) == \
+        pytest.approx(expected.mean("bmi", ignore_na=True))
+    assert comma.stream_minimum("bmi", rows=3) == expected.minimum("bmi")
+    assert comma.stream_maximum("bmi", rows=3) == expected.maximum("bmi")
+    assert comma.stream_value_counts("gender", rows=3) == \
+        expected.value_counts("gender")
+
+def test_stream_sum_reports_global_row(sample_path):
+    comma = Comma(sample_path)
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.stream_sum("bmi", rows=3)
+
+    assert "row 1 " in str(excinfo.value)
+
+def test_stream_column_does_not_exist(sample_path):
+    comma = Comma(sample_path)
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.stream_sum("this_column_does_not_exist")
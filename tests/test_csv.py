@@ -0,0 +1,61 @@
+"""
+This file contains tests for the csv export functions within class Comma.
+"""
+from ..pycomma.comma import Comma
+import pytest
+import csv
+import gzip
+import bz2
+import lzma
+import os
+
+def read_sample(sample_path):
+    with open(sample_path, encoding="utf-8") as sample:
+        return sample.read()
+
+def test_save_as_csv_round_trip(tmp_path, prepared, sample_path):
+    output_path = os.path.join(str(tmp_path), "out.csv")
+    prepared().save_as_csv(output_path, batch_size=3)
+
+    with open(output_path, encoding="utf-8") as output:
+        assert output.read() == read_sample(sample_path)
+
+def test_save_as_csv_quotes_values(tmp_path, prepared):
+    output_path = os.path.join(str(tmp_path), "out.csv")
+    comma = prepared()
+    comma.change("smoking_status", "never smoked", 'never, "ever"')
+    comma.save_as_csv(output_path)
+
+    with open(output_path, encoding="utf-8", newline="") as output:
+        rows = list(csv.reader(output))
+
+    assert rows[2][10] == 'never, "ever"'
+    assert len(rows[2]) == 12
+
+@pytest.mark.parametrize("extension, opener", [
+    (".gz", gzip.open), 
+    (".bz2", bz2.open), 
+    (".xz", lzma.open)
+])
+def test_save_as_csv_compressed(
+    tmp_path,
+    extension,
+    opener,
+    prepared,
+    sample_path
+):
+    output_path = os.path.join(str(tmp_path), "out.csv" + extension)
+    prepared().save_as_csv(output_path)
+
+    with opener(output_path, mode="rt", encoding="utf-8") as output:
+        assert output.read() == read_sample(sample_path)
+
+def test_save_as_csv_from_chunks_without_prepare(tmp_path, sample_path):
+    output_path = os.path.join(str(tmp_path), "out.csv")
+    comma = Comma(sample_path)
+    comma.set_config("success_messages", False)
+    comma.save_as_csv(output_path, chunks=comma.iter_chunks(rows=7))
+
+    assert comma._get_prepared() == False
+    with open(output_path, encoding="utf-8") as output:
+        assert output.read() == read_sample(sample_path)
@@ -0,0 +1,124 @@
+"""
+This file contains tests for the multi-file CommaDataset.
+"""
+from ..pycomma.dataset import CommaDataset
+import pytest
+import os
+
+def write_shards(tmp_path, sample_path):
+    # rows 0-6, 7-13 and 14-19 of the sample in three daily shards
+    with open(sample_path, mode="r", encoding="utf-8") as csv_file:
+        header = csv_file.readline()
+        lines = csv_file.readlines()
+
+    for day, start in ((1, 0), (2, 7), (3, 14)):
+        path = tmp_path / ("data-2026-10-0" + str(day) + ".csv")
+        with open(path, mode="w", encoding="utf-8") as shard:
+            shard.write(header)
+            shard.writelines(lines[start:start + 7])
+
+    return str(tmp_path / "data-2026-10-*.csv")
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_aggregations_match_single_file(
+    tmp_path,
+    workers,
+    prepared,
+    sample_path
+):
+    pattern = write_shards(tmp_path, sample_path)
+    dataset = CommaDataset(pattern, workers=workers)
+    comma = prepared()
+
+    assert len(dataset.get_paths()) == 3
+    assert dataset.get_header() == comma.get_header()
+    assert dataset.sum("age") == pytest.approx(comma.sum("age"))
+    assert dataset.mean("bmi", ignore_na=True) == \
+        pytest.approx(comma.mean("bmi", ignore_na=True))
+    assert dataset.minimum("age") == comma.minimum("age")
+    assert dataset.maximum("avg_glucose_level") == \
+        comma.maximum("avg_glucose_level")
+    assert dataset.value_counts("gender") == comma.value_counts("gender")
+
+    with pytest.raises(ValueError) as excinfo:
+        dataset.mean("bmi")
+
+def test_prune_by_pattern_and_range(tmp_path, prepared, sample_path):
+    dataset = CommaDataset(write_shards(tmp_path, sample_path), workers=1)
+    ids = prepared().column_values("id")
+
+    first_two = dataset.prune(pattern="data-2026-10-0[12].csv")
+    assert [os.path.basename(p) for p in first_two.get_paths()] == [
+        "data-2026-10-01.csv", "data-2026-10-02.csv"
+    ]
+
+    ranges = dataset.column_ranges("age")
+    assert all(len(shard_range) == 2 for shard_range in ranges.values())
+
+    oldest = max(ranges.values(), key=lambda r: r[0])
+    pruned = dataset.prune(column_name="age", lo=oldest[0], hi=None)
+    assert 1 <= len(pruned.get_paths()) <= 3
+
+    nothing = dataset.prune(column_name="age", lo=1000)
+    assert nothing.get_paths() == []
+    assert nothing.value_counts("gender") == {}
+    assert dataset.sum("id") == sum(float(i) for i in ids)
+
+def test_dataset_as_one_table(tmp_path, prepared, sample_path):
+    dataset = CommaDataset(write_shards(tmp_path, sample_path), workers=1)
+    comma = prepared()
+
+    assert list(dataset.to_comma().get_data()) == list(comma.get_data())
+
+    result = dataset.lazy().filter("gender", "==", "Male").select(["id"])
+    assert result.collect().column_values("id") == [
+        row[0] for row in comma.get_data() if row[1] == "Male"
+    ]
+
+    grouped = dataset.group_by("gender").agg({"age": "count"})
+    assert sorted(grouped.get_data()) == [["Female", "12"], ["Male", "8"]]
+
+def test_dataset_rejects_mismatched_headers(tmp_path, sample_path):
+    pattern = write_shards(tmp_path, sample_path)
+    with open(tmp_path / "data-2026-10-04.csv", mode="w") as shard:
+        shard.write("id,other\n1,2\n")
+
+    with pytest.raises(ValueError) as excinfo:
+        CommaDataset(pattern)
+
+    with pytest.raises(ValueError) as excinfo:
+        CommaDataset(str(tmp_path / "missing-*.csv"))
+
+def test_range_cache_is_reused_by_a_new_dataset(
+    tmp_path,
+    monkeypatch,
+    sample_path
+):
+    pattern = write_shards(tmp_path, sample_path)
+    cache = str(tmp_path / "ranges.json")
+    ranges = CommaDataset(pattern, workers=1, range_cache=cache) \
+        .column_ranges("age")
+    assert os.path.exists(cache)
+
+    from ..pycomma import dataset as dataset_module
+    scanned = []
+    shard_stats = dataset_module._shard_stats
+
+    def counting_shard_stats(path, *args, **kwargs):
+        scanned.append(os.path.basename(path))
+        return shard_stats(path, *args, **kwargs)
+
+    monkeypatch.setattr(dataset_module, "_shard_stats", counting_shard_stats)
+    dataset = CommaDataset(pattern, workers=1, range_cache=cache)
+    assert dataset.column_ranges("age") == ranges
+    assert scanned == []
+
+    # a shard that changed on disk is scanned again
+    with open(sample_path, mode="r", encoding="utf-8") as csv_file:
+        extra_line = csv_file.readlines()[1]
+    changed = tmp_path / "data-2026-10-03.csv"
+    with open(changed, mode="a", encoding="utf-8") as shard:
+        shard.write(extra_line)
+    dataset = CommaDataset(pattern, workers=1, range_cache=cache)
+    dataset.column_ranges("age")
+    assert scanned == ["data-2026-10-03.csv"]
@@ -0,0 +1,60 @@
+"""
+This file contains tests for the describe() function of class Comma.
+"""
+from ..pycomma.comma import Comma
+import pytest
+import statistics
+
+def summary_of(result) -> dict:
+    header = result.get_header()
+    return {row[0]: dict(zip(header, row)) for row in result.get_data()}
+
+@pytest.mark.parametrize("storage", ["rows", "columnar"])
+@pytest.mark.parametrize("workers", [None, 1, 2])
+def test_describe_numeric_columns(storage, workers, prepared):
+    comma = prepared(storage=storage)
+    summary = summary_of(comma.describe(workers=workers))
+
+    assert "gender" not in summary
+    assert "id" in summary and "age" in summary
+
+    ages = [float(age) for age in comma.column_values("age")]
+    assert float(summary["age"]["mean"]) == pytest.approx(statistics.mean(ages))
+    assert float(summary["age"]["stdev"]) == \
+        pytest.approx(statistics.stdev(ages))
+    assert float(summary["age"]["median"]) == statistics.median(ages)
+    assert float(summary["age"]["minimum"]) == min(ages)
+    assert float(summary["age"]["maximum"]) == max(ages)
+    assert summary["age"]["count"] == "20"
+    assert summary["age"]["null_count"] == "0"
+
+    bmis = [float(b) for b in comma.column_values("bmi") if b != "N/A"]
+    assert int(summary["bmi"]["count"]) == len(bmis)
+    assert int(summary["bmi"]["null_count"]) == 20 - len(bmis)
+    assert float(summary["bmi"]["mean"]) == pytest.approx(statistics.mean(bmis))
+
+def test_describe_selected_columns_and_quantiles(prepared):
+    comma = prepared()
+    result = comma.describe(["gender", "age"], workers=2, quantiles=[0.25, 1])
+
+    assert result.get_header()[-2:] == ["q0.25", "q1"]
+    summary = summary_of(result)
+    assert list(summary) == ["gender", "age"]
+    assert summary["gender"]["count"] == "0"
+    assert summary["gender"]["mean"] == ""
+    assert float(summary["age"]["q1"]) == comma.maximum("age")
+
+def test_describe_errors(sample_path, prepared):
+    comma = prepared()
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.describe(["missing"])
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.describe(workers=0)
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.describe(quantiles=[1.5])
+
+    with pytest.raises(Exception) as excinfo:
+        Comma(sample_path).describe()
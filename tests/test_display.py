@@ -0,0 +1,53 @@
+"""
+This file contains tests for the display functions within class Comma.
+"""
+import pytest
+
+def ids_shown(output) -> list:
+    return [line.split()[0] for line in output.splitlines()[1:]]
+
+def test_repr_outside_a_terminal(prepared):
+    comma = prepared()
+    output = repr(comma)
+    lines = output.splitlines()
+    ids = comma.column_values("id")
+
+    assert lines[0].startswith("id")
+    assert ids_shown(output) == ids[:5]
+    assert all(len(line) <= 80 for line in lines)
+    assert lines[0].endswith("->")
+
+def test_show_window_is_used_once(prepared):
+    comma = prepared()
+    ids = comma.column_values("id")
+
+    assert ids_shown(repr(comma.show(3, 10))) == ids[3:11]
+    assert ids_shown(repr(comma)) == ids[:5]
+    assert ids_shown(repr(comma.show(17))) == ids[17:]
+
+def test_pages(prepared):
+    comma = prepared()
+    ids = comma.column_values("id")
+
+    assert ids_shown(repr(comma.page(1))) == ids[5:10]
+    assert ids_shown(repr(comma.next_page())) == ids[10:15]
+    assert ids_shown(repr(comma)) == ids[10:15]
+    assert ids_shown(repr(comma.next_page())) == ids[15:20]
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.next_page()
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.page(-1)
+
+def test_widths_come_from_the_window(prepared):
+    comma = prepared()
+    comma.set_config("max_row_display", 1)
+    header = repr(comma.show(1, 1)).splitlines()[0]
+
+    # row 1 has the short id 51676 and the gender Female
+    assert header.startswith("id     gender  age")
+
+def test_sampled_repr_has_a_note(prepared):
+    output = repr(prepared(head=3))
+    assert output.splitlines()[-1] == "First 3 rows, results are estimates"
@@ -0,0 +1,104 @@
+"""
+This file contains tests for the parser engines used by class Comma.
+"""
+from ..pycomma.comma import Comma
+from ..pycomma import engines
+import pytest
+import io
+
+QUOTED_CSV = (
+    'id,name,note\n'
+    '1,"Smith, Jane","says ""hi"""\n'
+    '2,Doe,"two\nlines"\n'
+    '3,Roe,plain\n'
+)
+
+def write_quoted(tmp_path):
+    path = str(tmp_path / "quoted.csv")
+    with open(path, mode="w", encoding="utf-8", newline="") as csv_file:
+        csv_file.write(QUOTED_CSV)
+    return path
+
+@pytest.mark.parametrize("engine", ["csv", "auto"])
+def test_quote_aware_engines(tmp_path, engine, prepared):
+    comma = prepared(write_quoted(tmp_path), engine=engine)
+
+    assert comma.get_header() == ["id", "name", "note"]
+    assert list(comma.get_data()) == [
+        ["1", "Smith, Jane", 'says "hi"'],
+        ["2", "Doe", "two\nlines"],
+        ["3", "Roe", "plain"]
+    ]
+
+def test_engines_agree_on_unquoted_data(sample_path, prepared):
+    fast = prepared(engine="fast")
+    for engine in ("csv", "auto"):
+        comma = prepared(engine=engine)
+        assert list(comma.get_data()) == list(fast.get_data())
+
+def test_blocks_never_split_quoted_fields():
+    engine = engines.create("csv", block_size=8)
+    blocks = list(engine.blocks(io.StringIO(QUOTED_CSV)))
+
+    assert "".join(blocks) == QUOTED_CSV
+    assert all(block.count('"') % 2 == 0 for block in blocks)
+
+    chunks = list(engine.read(io.StringIO(QUOTED_CSV), rows=3))
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+
+def test_engine_stats(tmp_path, prepared):
+    comma = prepared(write_quoted(tmp_path), engine="auto")
+    stats = comma.get_engine_stats()
+
+    assert comma.get_engine() == "auto"
+    assert stats["engine"] == "auto"
+    assert stats["rows"] == 3
+    assert stats["blocks"] == {"csv": 1}
+    assert stats["seconds"] >= 0
+
+def test_engine_with_workers_and_usecols(sample_path, prepared):
+    fast = prepared(engine="fast", usecols=["gender"])
+    comma = prepared(engine="csv", workers=2, usecols=["gender"])
+
+    assert list(comma.get_data()) == list(fast.get_data())
+    assert comma.get_engine_stats()["rows"] == 20
+
+def test_invalid_engine(sample_path):
+    with pytest.raises(ValueError) as excinfo:
+        Comma(sample_path, engine="random")
+
+@pytest.mark.parametrize("engine", ["fast", "csv", "auto"])
+def test_engines_on_an_empty_file(tmp_path, engine):
+    path = str(tmp_path / "empty.csv")
+    open(path, mode="w").close()
+
+    comma = Comma(path, engine=engine)
+    comma.set_config("success_messages", False)
+    comma.prepare()
+    assert comma.get_header() == [""]
+    assert list(comma.get_data()) == []
+
+@pytest.mark.parametrize("engine", ["csv", "auto"])
+def test_stray_quote_inside_a_field(tmp_path, prepared, engine):
+    # the quote in 5" is a literal, it does not open a quoted field
+    path = str(tmp_path / "stray.csv")
+    with open(path, mode="w", encoding="utf-8") as csv_file:
+        csv_file.write("id,name,note\n")
+        for i in range(3000):
+            name = '5" screen' if i == 10 else "item " + str(i)
+            csv_file.write(str(i) + "," + name + ",x\n")
+
+    for workers in (None, 2):
+        comma = prepared(path, engine=engine, workers=workers)
+        assert len(comma.get_data()) == 3000
+        assert comma.get_row_values(10) == ["10", '5" screen', "x"]
+        assert comma.get_row_values(11) == ["11", "item 11", "x"]
+
+def test_unclosed_quote_reports_its_line():
+    engine = engines.create("csv", block_size=8)
+    engine.quote_lookahead = 3
+    text = '1,a\n2,"open\n3,b\n4,c\n5,d\n6,e\n'
+
+    with pytest.raises(ValueError) as excinfo:
+        list(engine.blocks(io.StringIO(text)))
+    assert "line 2" in str(excinfo.value)
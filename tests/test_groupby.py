@@ -0,0 +1,105 @@
+"""
+This file contains tests for the group_by function within class Comma.
+"""
+from ..pycomma.comma import Comma
+from ..pycomma.groupby import GroupBy
+import pytest
+
+def as_dict(result, key_count=1):
+    return {
+        tuple(row[:key_count]): row[key_count:] 
+        for row in result.get_data()
+    }
+
+def test_group_by_single_column(prepared):
+    comma = prepared()
+    result = comma.group_by("gender").agg({"age": ["count", "min", "max", "sum"]})
+
+    assert result.get_header() == \
+        ["gender", "age_count", "age_min", "age_max", "age_sum"]
+    assert as_dict(result) == {
+        ("Male",): ["8", "57.0", "81.0", "576.0"],
+        ("Female",): ["12", "49.0", "81.0", "780.0"]
+    }
+
+def test_group_by_mean_matches_filtered_mean(prepared):
+    comma = prepared()
+    result = comma.group_by(["gender", "ever_married"]).agg({"bmi": "mean"})
+    groups = as_dict(result, key_count=2)
+
+    male_bmi = [
+        float(comma.get(i, ["bmi"])["bmi"]) 
+        for i in comma.find_by("gender", "Male") 
+        if comma.get(i, ["bmi"])["bmi"] != "N/A"
+        and comma.get(i, ["ever_married"])["ever_married"] == "Yes"
+    ]
+    assert float(groups[("Male", "Yes")][0]) == \
+        pytest.approx(sum(male_bmi) / len(male_bmi))
+    assert groups[("Male", "No")] == [""]
+
+def test_group_by_spills_to_disk(sample_path, prepared):
+    expected = as_dict(prepared().group_by("id").agg({"age": ["sum", "mean"]}))
+
+    comma = Comma(sample_path)
+    comma.set_config("success_messages", False)
+    spilled = comma.group_by("id", max_groups=2).agg({"age": ["sum", "mean"]})
+
+    assert as_dict(spilled) == expected
+    assert spilled.dimension() == {"columns": 3, "rows": 20}
+
+def test_group_by_invalid_arguments(prepared):
+    comma = prepared()
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.group_by("gender").agg({"age": "median"})
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.group_by("this_column_does_not_exist").agg({"age": "sum"})
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.group_by("gender", max_groups=0)
+
+def test_group_by_never_holds_more_than_max_groups(monkeypatch, sample_path):
+    spilled_sizes = []
+    spill = GroupBy._spill
+
+    def recording_spill(self, groups, spill_dir, depth):
+        spilled_sizes.append((depth, len(groups)))
+        return spill(self, groups, spill_dir, depth)
+
+    monkeypatch.setattr(GroupBy, "_spill", recording_spill)
+    comma = Comma(sample_path)
+    comma.set_config("success_messages", False)
+    comma.group_by("id", max_groups=3).agg({"age": "sum"})
+
+    # partitions are only re-spilled when hashing leaves one too large
+    scan_sizes = [size for depth, size in spilled_sizes if depth == 0]
+    assert scan_sizes == [3, 3, 3, 3, 3, 3, 2]
+    assert max(size for depth, size in spilled_sizes) <= 3
+
+def test_group_by_respills_partitions_over_max_groups(
+    monkeypatch,
+    sample_path,
+    prepared
+):
+    expected = as_dict(prepared().group_by("id").agg({"age": "sum"}))
+    merged_sizes = []
+    partitions = GroupBy._partitions
+
+    def recording_partitions(self, groups, spill_files, spill_dir, depth):
+        for merged in partitions(self, groups, spill_files, spill_dir, depth):
+            # nested re-spills yield through the outermost call as well
+            if depth == 1:
+                merged_sizes.append(len(merged))
+            yield merged
+
+    monkeypatch.setattr(GroupBy, "_partitions", recording_partitions)
+    comma = Comma(sample_path)
+    comma.set_config("success_messages", False)
+    # 20 groups over 2 partitions cannot fit in 3 groups without re-spilling
+    grouped = GroupBy(comma, "id", max_groups=3, partitions=2) \
+        .agg({"age": "sum"})
+
+    assert as_dict(grouped) == expected
+    assert sum(merged_sizes) == 20
+    assert max(merged_sizes) <= 3
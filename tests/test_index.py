@@ -0,0 +1,57 @@
+"""
+This file contains tests for the secondary index functions within class Comma.
+"""
+import pytest
+
+def test_create_index_invalid_kind(prepared):
+    comma = prepared()
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.create_index("gender", kind="random")
+
+def test_hash_index_matches_scan(prepared):
+    comma = prepared()
+    expected = comma.find_by("work_type", "Self-employed")
+    comma.create_index("work_type")
+
+    assert comma.get_indexes() == {"work_type": "hash"}
+    assert comma.find_by("work_type", "Self-employed") == expected == [1, 4, 15]
+
+def test_sorted_index_range_and_prefix(prepared):
+    comma = prepared()
+    comma.create_index("age", kind="sorted")
+    comma.create_index("smoking_status", kind="sorted")
+
+    assert comma.rows_between("age", 78, 80) == [2, 4, 9, 13, 14]
+    assert comma.rows_between("age", hi=50) == [3, 15]
+    assert comma.rows_with_prefix("smoking_status", "formerly") == [0, 5]
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.rows_with_prefix("age", "7")
+
+def test_rows_between_requires_sorted_index(prepared):
+    comma = prepared()
+    comma.create_index("age")
+
+    with pytest.raises(Exception) as excinfo:
+        comma.rows_between("age", 1, 2)
+
+def test_indexes_follow_mutations(prepared):
+    comma = prepared()
+    comma.create_index("age", kind="sorted")
+    comma.create_index("gender")
+
+    comma.add_row(["1", "Other", "50"] + ["x"] * 9)
+    assert comma.rows_between("age", hi=50) == [3, 15, 20]
+    assert comma.find_by("gender", "Other") == [20]
+
+    comma.delete_rows([3, 15])
+    assert comma.rows_between("age", hi=50) == [18]
+
+    comma.change("gender", "Other", "Male")
+    comma.change_column_name("gender", "sex")
+    assert comma.get_indexes() == {"age": "sorted", "sex": "hash"}
+    assert comma.find_by("sex", "Other") == []
+
+    comma.add_row(["2", "Female", "unknown"] + ["x"] * 9)
+    assert comma.rows_with_prefix("age", "unk") == [19]
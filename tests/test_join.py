@@ -0,0 +1,97 @@
+"""
+This file contains tests for the join function within class Comma.
+"""
+import pytest
+
+def lookup_table(prepared):
+    # ids 9046 and 31112 exist in the sample, 1 does not
+    comma = prepared()
+    comma.delete_rows(list(range(3, 20)))
+    comma.delete_row(1)
+    comma.add_row(["1", "Other", "5"] + [""] * 9)
+    for column_name in comma.get_header()[3:]:
+        comma.delete_column(column_name)
+    comma.change_column_name("age", "age_at_visit")
+    return comma
+
+@pytest.mark.parametrize("strategy", ["hash", "sort_merge"])
+def test_join_inner(strategy, prepared):
+    left = prepared()
+    result = left.join(lookup_table(prepared), on="id", strategy=strategy)
+
+    assert result.get_header() == \
+        left.get_header() + ["gender_right", "age_at_visit"]
+    assert sorted(result.column_values("id")) == ["31112", "9046"]
+    assert result.get(result.find_by("id", "9046")[0], ["age_at_visit"]) == \
+        {"age_at_visit": "67"}
+
+@pytest.mark.parametrize("strategy", ["hash", "sort_merge"])
+def test_join_left_and_outer(strategy, prepared):
+    left = prepared()
+    right = lookup_table(prepared)
+
+    result = left.join(right, on="id", how="left", strategy=strategy)
+    assert result.dimension()["rows"] == 20
+    assert result.get(result.find_by("id", "1665")[0], ["gender_right"]) == \
+        {"gender_right": ""}
+
+    result = left.join(right, on="id", how="outer", strategy=strategy)
+    assert result.dimension()["rows"] == 21
+    row = result.get(result.find_by("id", "1")[0], ["gender", "age_at_visit"])
+    assert row == {"gender": "", "age_at_visit": "5"}
+
+def test_join_uses_primary_columns(prepared):
+    left = prepared(storage="columnar")
+    right = lookup_table(prepared)
+    right.assign_primary("id")
+
+    result = left.join(right)
+    assert result.get_storage() == "columnar"
+    assert result.dimension() == {"columns": 14, "rows": 2}
+
+    with pytest.raises(Exception) as excinfo:
+        prepared().join(prepared())
+
+def test_join_invalid_arguments(prepared):
+    comma = prepared()
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.join(comma, on="id", how="cross")
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.join(comma, on=("id", "this_column_does_not_exist"))
+
+@pytest.mark.parametrize("how", ["inner", "left", "outer"])
+def test_join_strategies_keep_left_order(how, prepared):
+    left = prepared()
+    right = lookup_table(prepared)
+    right.add_row(["9046", "Male", "70"])
+
+    hashed = left.join(right, on="id", how=how, strategy="hash")
+    merged = left.join(right, on="id", how=how, strategy="sort_merge")
+
+    assert list(merged.get_data()) == list(hashed.get_data())
+    if how != "inner":
+        ids = left.column_values("id")
+        assert merged.column_values("id")[:21] == ids[:1] + ids
+
+def test_columnar_join_keeps_column_containers(prepared):
+    left = prepared(storage="columnar")
+    left.encode_categorical("gender")
+    right = prepared(storage="columnar")
+    for column_name in right.get_header()[3:]:
+        right.delete_column(column_name)
+
+    result = left.join(right, on="id")
+    store = result.get_data()
+    header = result.get_header()
+
+    assert store.column_kind(header.index("gender")) == "category"
+    assert store.column_kind(header.index("avg_glucose_level")) == "float"
+    assert store.column_kind(header.index("age_right")) == "int"
+
+    plain_right = prepared()
+    for column_name in plain_right.get_header()[3:]:
+        plain_right.delete_column(column_name)
+    plain = prepared().join(plain_right, on="id")
+    assert list(store) == list(plain.get_data())
@@ -3,6 +3,7 @@ This file contains tests for the json functions within class Comma.
 """
 from ..pycomma.comma import Comma
 import pytest
+import json
 import os
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -28,4 +29,41 @@ def test_save_as_csv_when_prepared_is_false():
     assert comma._get_prepared() == False
 
     with pytest.raises(Exception) as excinfo:
-        comma.save_as_csv()
\ No newline at end of file
+        comma.save_as_csv()
+
+def test_get_json_lazy_matches_full(prepared):
+    comma = prepared()
+    full = comma.get_json()
+
+    assert full["headers"] == comma.get_header()
+    assert list(comma.get_json(lazy=True)) == full["data"]
+
+def test_get_json_reflects_mutations(prepared):
+    comma = prepared()
+    comma.get_json()
+    comma.change("gender", "Male", "M")
+    assert comma.get_json()["data"][0]["gender"] == "M"
+
+@pytest.mark.parametrize("use_wrapper", [True, False])
+def test_save_as_json_matches_json_dump(tmp_path, use_wrapper, prepared):
+    output_path = os.path.join(str(tmp_path), "out.json")
+    comma = prepared()
+    comma.save_as_json(output_path, use_wrapper=use_wrapper, batch_size=3)
+
+    expected = comma.get_json()
+    if not use_wrapper:
+        expected = expected["data"]
+
+    with open(output_path, encoding="utf-8") as output:
+        assert output.read() == json.dumps(expected)
+
+def test_save_as_json_lines_from_chunks(tmp_path, prepared, sample_path):
+    output_path = os.path.join(str(tmp_path), "out.ndjson")
+    comma = Comma(sample_path)
+    comma.set_config("success_messages", False)
+    comma.save_as_json(output_path, lines=True, chunks=comma.iter_chunks(rows=6))
+
+    with open(output_path, encoding="utf-8") as output:
+        rows = [json.loads(line) for line in output]
+
+    assert rows == prepared().get_json()["data"]
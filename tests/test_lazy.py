@@ -0,0 +1,93 @@
+"""
+This file contains tests for the lazy query builder returned by
+Comma.lazy().
+"""
+from ..pycomma.comma import Comma
+import pytest
+import os
+
+def test_lazy_filter_select_collect(prepared):
+    comma = prepared()
+    result = comma.lazy() \
+        .filter("age", ">=", 80) \
+        .filter("gender", "==", "Female") \
+        .select(["id", "age"]) \
+        .collect()
+
+    assert result.get_header() == ["id", "age"]
+    assert list(result.get_data()) == [["12109", "81"]]
+    assert comma.dimension()["rows"] == 20
+
+def test_lazy_collect_does_not_share_rows(prepared):
+    comma = prepared()
+    result = comma.lazy().filter("gender", "==", "Male").collect()
+    result.change("gender", "Male", "M")
+
+    assert comma.value_counts("gender")["Male"] == 8
+
+def test_lazy_with_column_and_pushdown(prepared):
+    comma = prepared()
+    query = comma.lazy() \
+        .with_column("age_months", lambda age: int(age) * 12, ["age"]) \
+        .with_column("unused", lambda row: 1) \
+        .filter("stroke", "==", 1) \
+        .filter("age_months", "<", 600) \
+        .select(["id", "age_months"])
+
+    assert query.explain() == [
+        "scan id, age, stroke",
+        "filter stroke",
+        "with_column age_months",
+        "filter age_months",
+        "select id, age_months"
+    ]
+    assert list(query.collect().get_data()) == [["60182", "588"]]
+
+def test_lazy_agg(prepared):
+    comma = prepared()
+    result = comma.lazy() \
+        .filter("gender", "==", "Male") \
+        .agg({"age": ["count", "min", "max"], "bmi": "mean"}) \
+        .collect()
+
+    assert result.get_header() == ["age_count", "age_min", "age_max", "bmi_mean"]
+    assert result.get_row_values(0)[:3] == ["8", "57.0", "81.0"]
+
+    with pytest.raises(Exception) as excinfo:
+        comma.lazy().agg({"age": "sum"}).select(["age_sum"])
+
+def test_lazy_streams_from_file(tmp_path, sample_path):
+    output_path = os.path.join(str(tmp_path), "out.csv")
+    comma = Comma(sample_path)
+    comma.set_config("success_messages", False)
+    comma.lazy().filter("work_type", "==", "Govt_job") \
+        .select(["id"]).save_as_csv(output_path)
+
+    assert comma._get_prepared() == False
+    with open(output_path, encoding="utf-8") as output:
+        assert output.read() == "id\n12095\n25226\n"
+
+def test_lazy_unknown_column(prepared):
+    comma = prepared()
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.lazy().select(["this_column_does_not_exist"]).collect()
+
+def test_lazy_select_then_select(prepared):
+    comma = prepared()
+    query = comma.lazy().select(["age", "gender"]).select(["age"])
+
+    assert query.explain() == ["scan age", "select age", "select age"]
+    assert query.collect().column_values("age") == comma.column_values("age")
+
+    query = comma.lazy() \
+        .select(["id", "age", "gender"]) \
+        .with_column("age_months", lambda age: int(age) * 12, ["age"]) \
+        .select(["id", "age_months"])
+    assert query.collect().get_row_values(0) == ["9046", "804"]
+
+def test_lazy_select_then_agg(prepared):
+    comma = prepared()
+    result = comma.lazy().select(["age", "gender"]).agg({"age": "sum"})
+
+    assert result.collect().get_row_values(0) == [str(comma.sum("age"))]
@@ -58,4 +58,82 @@ def test_prepare_when_includes_header_is_false_and_header_is_default_value():
     with pytest.raises(Exception) as excinfo:
         comma.prepare()
     
-    assert comma.file_is_closed() == True
\ No newline at end of file
+    assert comma.file_is_closed() == True
+
+def test_prepare_with_workers_matches_sequential(sample_path):
+    sequential = Comma(sample_path)
+    sequential.prepare()
+
+    for storage in ("rows", "columnar"):
+        parallel = Comma(sample_path, storage=storage)
+        parallel.prepare(workers=3)
+        assert parallel.get_header() == sequential.get_header()
+        assert list(parallel.get_data()) == list(sequential.get_data())
+
+def test_prepare_with_invalid_workers():
+    comma = Comma(test_data_with_header_path)
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.prepare(workers=0)
+
+    assert comma._get_prepared() == False
+
+def test_prepare_with_usecols_and_where(sample_path):
+    full = Comma(sample_path)
+    full.prepare()
+    ages = full.column_values("age")
+    genders = full.column_values("gender")
+    ids = full.column_values("id")
+    expected = [
+        [ages[i], ids[i]] for i in range(20) if genders[i] == "Male"
+    ]
+
+    for workers in (None, 2):
+        comma = Comma(sample_path)
+        comma.prepare(
+            workers=workers, 
+            usecols=["age", "id"], 
+            where={"gender": "Male"}
+        )
+        assert comma.get_header() == ["age", "id"]
+        assert list(comma.get_data()) == expected
+
+def test_prepare_with_where_predicates(sample_path):
+    comma = Comma(sample_path)
+    comma.prepare(where={"smoking_status": ["smokes", "never smoked"]})
+    assert set(comma.unique_values("smoking_status")) == \
+        {"smokes", "never smoked"}
+
+    # the last column keeps no trailing newline
+    comma = Comma(sample_path)
+    comma.prepare(usecols=["stroke"], where={"age": lambda v: int(v) > 78})
+    assert comma.unique_values("stroke") == ["1"]
+
+    comma = Comma(sample_path)
+    comma.prepare(where=lambda row: row["bmi"] == "N/A")
+    assert len(comma.get_data()) == 4
+    assert len(comma.get_header()) == 12
+
+def test_prepare_with_lambda_predicates_and_workers(sample_path):
+    predicates = (
+        {"age": lambda v: int(v) > 78}, 
+        lambda row: int(row["age"]) > 78
+    )
+    for where in predicates:
+        sequential = Comma(sample_path)
+        sequential.prepare(usecols=["id", "age"], where=where)
+
+        comma = Comma(sample_path)
+        comma.prepare(usecols=["id", "age"], where=where, workers=2)
+        assert comma.get_header() == ["id", "age"]
+        assert list(comma.get_data()) == list(sequential.get_data())
+        assert len(comma.get_data()) > 0
+
+def test_prepare_with_invalid_usecols(sample_path):
+    comma = Comma(sample_path)
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.prepare(usecols=["unknown"])
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.prepare(where="gender")
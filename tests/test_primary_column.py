@@ -27,4 +27,45 @@ def test_get_primary_column_name():
     comma = Comma(test_data_with_header_path)
     comma.prepare()
     comma.assign_primary("id")
-    assert comma.get_primary() == "id"
\ No newline at end of file
+    assert comma.get_primary() == "id"
+
+@pytest.fixture
+def indexed(prepared):
+    comma = prepared()
+    comma.assign_primary("id")
+    return comma
+
+def test_find_row_uses_primary_index(indexed):
+    comma = indexed
+    assert comma.find_row("31112") == 2
+    assert comma.find_row(25226) == 19
+
+    with pytest.raises(Exception) as excinfo:
+        comma.find_row("0")
+
+def test_find_rows_returns_row_order(indexed):
+    comma = indexed
+    assert comma.find_rows(["25226", "0", "9046"]) == [0, 19]
+
+def test_primary_index_follows_mutations(indexed):
+    comma = indexed
+    comma.add_row(["1"] + ["x"] * 11)
+    assert comma.find_row("1") == 20
+
+    comma.delete_row(0)
+    assert comma.find_row("31112") == 1
+
+    comma.sort_by_column("id")
+    assert comma.find_row("1") == 0
+
+    comma.change("id", "1", "2")
+    assert comma.find_row("2") == 0
+
+    comma.change_column_name("id", "key")
+    assert comma.find_rows(["2", "1665"]) == [0, 1]
+
+def test_assign_primary_rejects_duplicates(indexed):
+    comma = indexed
+
+    with pytest.raises(Exception) as excinfo:
+        comma.assign_primary("gender")
@@ -0,0 +1,66 @@
+"""
+This file contains tests for the bulk row functions within class Comma.
+"""
+import pytest
+
+@pytest.mark.parametrize("storage", ["rows", "columnar"])
+def test_delete_rows_with_indices_and_mask(storage, prepared):
+    comma = prepared(storage=storage)
+    ids = comma.column_values("id")
+
+    comma.delete_rows({0, 2, -1})
+    assert comma.column_values("id") == ids[1:2] + ids[3:-1]
+
+    comma = prepared(storage=storage)
+    comma.delete_rows([i % 2 == 0 for i in range(20)])
+    assert comma.column_values("id") == ids[1::2]
+
+@pytest.mark.parametrize("storage", ["rows", "columnar"])
+def test_keep_rows(storage, prepared):
+    comma = prepared(storage=storage)
+    ids = comma.column_values("id")
+
+    comma.keep_rows(range(5))
+    assert comma.column_values("id") == ids[:5]
+
+def test_delete_rows_rejects_bad_input(prepared):
+    comma = prepared()
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.delete_rows("1")
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.delete_rows([True, False])
+
+    with pytest.raises(IndexError) as excinfo:
+        comma.delete_rows([20])
+
+    assert len(comma.get_data()) == 20
+
+def test_delete_where(prepared):
+    comma = prepared()
+    comma.create_index("gender")
+    comma.delete_where("gender", lambda value: value == "Male")
+
+    assert comma.value_counts("gender") == {"Female": 12}
+    assert comma.find_by("gender", "Female") == list(range(12))
+
+@pytest.mark.parametrize("storage", ["rows", "columnar"])
+def test_add_rows_in_batches(storage, prepared):
+    comma = prepared(storage=storage)
+    comma.assign_primary("id")
+    rows = ([str(i)] + ["x"] * 11 for i in range(100))
+    comma.add_rows(rows, batch_size=7)
+
+    assert len(comma.get_data()) == 120
+    assert comma.find_row("42") == 62
+
+def test_add_rows_validates_rows(prepared):
+    comma = prepared()
+
+    with pytest.raises(Exception) as excinfo:
+        comma.add_rows([["1"] * 12, ["1"] * 3])
+    assert "row 1" in str(excinfo.value)
+
+    comma.add_rows([tuple(["1"] * 12)])
+    assert comma.get_row_values(20) == ["1"] * 12
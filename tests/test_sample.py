@@ -0,0 +1,75 @@
+"""
+This file contains tests for the sampled prepare() of class Comma.
+"""
+from ..pycomma import stats
+import pytest
+
+def test_reservoir_keeps_stream_order():
+    reservoir = stats.Reservoir(5, seed=7)
+    reservoir.extend(list(range(50)))
+    reservoir.extend(list(range(50, 100)))
+    items = reservoir.items()
+
+    assert len(items) == 5
+    assert items == sorted(items)
+    assert reservoir.seen == 100
+
+    small = stats.Reservoir(10)
+    small.extend([1, 2, 3])
+    assert small.items() == [1, 2, 3]
+
+def test_prepare_with_head(prepared):
+    full = prepared()
+    comma = prepared(head=5)
+
+    assert list(comma.get_data()) == list(full.get_data())[:5]
+    assert comma.is_sampled()
+    assert comma.get_sample_info() == {"method": "head", "rows": 5}
+    assert not full.is_sampled()
+
+def test_head_and_sample_covering_the_file_are_not_sampled(prepared):
+    for comma in (prepared(head=50), prepared(head=20), prepared(sample=20)):
+        assert len(comma.get_data()) == 20
+        assert not comma.is_sampled()
+        assert comma.get_sample_info() is None
+        assert "estimate" not in comma.column_stats("age")
+
+    assert prepared(head=19).get_sample_info() == {"method": "head", "rows": 19}
+
+def test_prepare_with_sample_is_reproducible(prepared):
+    full = list(prepared().get_data())
+    first = prepared(sample=6, seed=3)
+    second = prepared(sample=6, seed=3)
+
+    rows = list(first.get_data())
+    assert rows == list(second.get_data())
+    assert len(rows) == 6
+    assert all(row in full for row in rows)
+    assert first.get_sample_info() == {
+        "method": "sample", "rows": 6, "rows_read": 20
+    }
+
+def test_sampled_results_are_flagged(prepared):
+    comma = prepared(sample=10, seed=1)
+    result = comma.column_stats("age")
+
+    assert result["estimate"] is True
+    assert result["sample"]["rows_read"] == 20
+    assert "estimate" not in prepared().column_stats("age")
+
+def test_sampled_value_counts_print_a_note(capsys, prepared):
+    comma = prepared(head=4)
+    comma.set_config("success_messages", True)
+    comma.value_counts("gender")
+
+    assert "First 4 rows" in capsys.readouterr().out
+
+def test_prepare_with_invalid_sample(prepared):
+    with pytest.raises(ValueError) as excinfo:
+        prepared(sample=0)
+
+    with pytest.raises(ValueError) as excinfo:
+        prepared(sample=3, head=3)
+
+    with pytest.raises(ValueError) as excinfo:
+        prepared(head=3, workers=2)
@@ -0,0 +1,76 @@
+"""
+This file contains tests for the approximate functions within class Comma
+and the sketches behind them.
+"""
+from ..pycomma.comma import Comma
+from ..pycomma import sketches
+import pytest
+import random
+
+def test_hyperloglog_small_counts_are_close():
+    sketch = sketches.HyperLogLog()
+    sketch.update(str(i) for i in range(1000))
+    sketch.update(str(i) for i in range(500))
+
+    assert abs(sketch.count() - 1000) <= 1000 * 3 * sketch.relative_error()
+
+def test_hyperloglog_merge_matches_single_sketch():
+    whole = sketches.HyperLogLog(precision=10)
+    left = sketches.HyperLogLog(precision=10)
+    right = sketches.HyperLogLog(precision=10)
+
+    for i in range(20000):
+        whole.add(i)
+        (left if i % 2 else right).add(i)
+
+    left.merge(right)
+    assert left.count() == whole.count()
+    assert abs(whole.count() - 20000) <= 20000 * 3 * whole.relative_error()
+
+    with pytest.raises(ValueError) as excinfo:
+        left.merge(sketches.HyperLogLog(precision=12))
+
+def test_kll_quantiles_within_rank_error():
+    values = list(range(100_000))
+    random.Random(0).shuffle(values)
+
+    sketch = sketches.KLLSketch(k=200, seed=1)
+    sketch.update(values)
+
+    # memory stays bounded by k, not by the number of values
+    assert sum(len(c) for c in sketch.compactors) < 2000
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+        error = abs(sketch.quantile(q) - q * len(values)) / len(values)
+        assert error <= 3 * sketch.rank_error()
+
+def test_kll_merge_keeps_count():
+    left = sketches.KLLSketch(k=64, seed=1)
+    right = sketches.KLLSketch(k=64, seed=2)
+    left.update(range(0, 10_000))
+    right.update(range(10_000, 20_000))
+
+    left.merge(right)
+    assert left.count == 20_000
+    assert abs(left.quantile(0.5) - 10_000) / 20_000 <= 3 * left.rank_error()
+
+def test_approx_unique_on_prepared_and_streamed_data(sample_path, prepared):
+    comma = prepared()
+    result = comma.approx_unique("gender")
+
+    assert result["estimate"] == 2
+    assert result["relative_error"] > 0
+
+    streamed = Comma(sample_path)
+    assert streamed.approx_unique("gender", rows=3)["estimate"] == 2
+
+def test_approx_quantile_skips_values_that_are_not_numbers(prepared):
+    comma = prepared()
+    result = comma.approx_quantile("age", [0, 1])
+
+    # small columns fit in the sketch, so the answer is exact
+    assert result["estimate"] == [49.0, 81.0]
+    assert result["count"] == 20
+    assert comma.approx_quantile("bmi", 0.5)["count"] == 16
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.approx_quantile("unknown", 0.5)
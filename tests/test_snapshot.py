@@ -0,0 +1,129 @@
+"""
+This file contains tests for the binary snapshots of class Comma.
+"""
+from ..pycomma.comma import Comma
+import pytest
+import shutil
+import os
+
+@pytest.mark.parametrize("storage", ["rows", "columnar"])
+def test_snapshot_round_trip(tmp_path, storage, prepared):
+    comma = prepared(storage=storage)
+    comma.change("bmi", "N/A", "")
+    path = str(tmp_path / "sample.snap")
+    comma.save_snapshot(path)
+
+    opened = Comma.open_snapshot(path)
+    assert opened.get_header() == comma.get_header()
+    assert list(opened.get_data()) == list(comma.get_data())
+    assert opened.get_storage() == "columnar"
+
+def test_snapshot_keeps_categorical_columns(tmp_path, prepared):
+    comma = prepared(storage="columnar", categorical=["gender"])
+    path = str(tmp_path / "sample.snap")
+    comma.save_snapshot(path)
+
+    opened = Comma.open_snapshot(path)
+    assert opened.get_data().column_kind(1) == "category"
+    assert opened.value_counts("gender") == comma.value_counts("gender")
+
+def test_open_snapshot_projects_columns(tmp_path, prepared):
+    comma = prepared()
+    path = str(tmp_path / "sample.snap")
+    comma.save_snapshot(path)
+
+    opened = Comma.open_snapshot(path, columns=["gender", "id"])
+    assert opened.get_header() == ["gender", "id"]
+    assert opened.column_values("id") == comma.column_values("id")
+
+    with pytest.raises(ValueError) as excinfo:
+        Comma.open_snapshot(path, columns=["unknown"])
+
+def test_snapshot_checksums(tmp_path, prepared):
+    comma = prepared()
+    path = str(tmp_path / "sample.snap")
+    comma.save_snapshot(path)
+
+    # flip one byte inside the first column block
+    with open(path, mode="r+b") as snapshot_file:
+        snapshot_file.seek(12)
+        byte = snapshot_file.read(1)
+        snapshot_file.seek(12)
+        snapshot_file.write(bytes([byte[0] ^ 0xFF]))
+
+    Comma.open_snapshot(path, columns=["gender"])
+    with pytest.raises(ValueError) as excinfo:
+        Comma.open_snapshot(path)
+    assert "checksum" in str(excinfo.value)
+
+    with open(path, mode="wb") as snapshot_file:
+        snapshot_file.write(b"id,gender\n" * 10)
+    with pytest.raises(ValueError) as excinfo:
+        Comma.open_snapshot(path)
+
+def test_prepare_reuses_snapshot_of_unchanged_file(
+    tmp_path,
+    capsys,
+    sample_path,
+    prepared
+):
+    csv_path = str(tmp_path / "sample.csv")
+    snapshot_path = str(tmp_path / "sample.snap")
+    shutil.copyfile(sample_path, csv_path)
+
+    first = prepared(csv_path, snapshot=snapshot_path)
+    assert os.path.exists(snapshot_path)
+
+    comma = Comma(csv_path)
+    comma.prepare(snapshot=snapshot_path)
+    assert "from snapshot" in capsys.readouterr().out
+    assert list(comma.get_data()) == list(first.get_data())
+
+    # a changed source file is parsed again and the snapshot rewritten
+    with open(csv_path, mode="a", encoding="utf-8") as csv_file:
+        csv_file.write("1,Male,1,0,0,No,Private,Urban,1,1,smokes,0\n")
+
+    comma = Comma(csv_path)
+    comma.prepare(snapshot=snapshot_path)
+    assert "from snapshot" not in capsys.readouterr().out
+    assert len(comma.get_data()) == 21
+
+def test_modified_data_is_not_reused(tmp_path, capsys, sample_path, prepared):
+    snapshot_path = str(tmp_path / "sample.snap")
+    comma = prepared()
+    comma.delete_row(0)
+    comma.save_snapshot(snapshot_path)
+
+    comma = Comma(sample_path)
+    comma.prepare(snapshot=snapshot_path)
+    assert "from snapshot" not in capsys.readouterr().out
+    assert len(comma.get_data()) == 20
+
+def test_projected_prepare_keeps_full_snapshot(
+    tmp_path,
+    capsys,
+    sample_path,
+    prepared
+):
+    csv_path = str(tmp_path / "sample.csv")
+    snapshot_path = str(tmp_path / "sample.snap")
+    shutil.copyfile(sample_path, csv_path)
+    prepared(csv_path, snapshot=snapshot_path)
+
+    projected = prepared(csv_path, snapshot=snapshot_path, usecols=["id"])
+    assert projected.get_header() == ["id"]
+
+    comma = Comma(csv_path)
+    comma.prepare(snapshot=snapshot_path)
+    assert "from snapshot" in capsys.readouterr().out
+    assert comma.dimension() == {"columns": 12, "rows": 20}
+
+def test_snapshot_of_rows_added_as_numbers(tmp_path, prepared):
+    comma = prepared()
+    comma.add_row(list(range(12)))
+    path = str(tmp_path / "sample.snap")
+    comma.save_snapshot(path)
+
+    opened = Comma.open_snapshot(path)
+    assert opened.get_row_values(-1) == [str(i) for i in range(12)]
+    assert opened.column_values("id")[:-1] == comma.column_values("id")[:-1]
@@ -0,0 +1,64 @@
+"""
+This file contains tests for the statistic functions within class Comma.
+"""
+from ..pycomma import stats
+import pytest
+import statistics
+
+def test_median_matches_statistics():
+    for values in ([3.0], [5.0, 1.0], [2.0, 2.0, 1.0, 2.0], [4.0, 1.0, 3.0, 2.0]):
+        assert stats.median(values) == statistics.median(values)
+
+def test_quantile_interpolates():
+    assert stats.quantile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert stats.quantile([1.0, 2.0, 3.0, 4.0], 1) == 4.0
+
+    with pytest.raises(ValueError) as excinfo:
+        stats.quantile([1.0], 2)
+
+def test_column_stats_matches_individual_functions(prepared):
+    comma = prepared()
+    result = comma.column_stats("bmi", ignore_na=True)
+
+    assert result["mean"] == pytest.approx(comma.mean("bmi", ignore_na=True))
+    assert result["median"] == comma.median("bmi", ignore_na=True)
+    assert result["stdev"] == pytest.approx(comma.stdev("bmi", ignore_na=True))
+    assert result["sum"] == pytest.approx(comma.sum("bmi", ignore_na=True))
+    assert result["minimum"] == comma.minimum("bmi")
+    assert result["maximum"] == comma.maximum("bmi")
+    assert "null_count" not in result
+
+def test_column_stats_quantiles_and_nulls(prepared):
+    comma = prepared()
+    result = comma.column_stats(
+        "bmi", 
+        ignore_na=True, 
+        quantiles=[0, 0.5, 1], 
+        include_nulls=True
+    )
+
+    assert result["quantiles"] == {0: 22.8, 0.5: result["median"], 1: 37.8}
+    assert result["null_count"] == 4
+
+def test_column_stats_raises_on_na(prepared):
+    comma = prepared()
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.column_stats("bmi")
+
+def test_running_stats_merge_matches_single_pass():
+    values = [228.69, 202.21, 105.92, 171.23, 174.12, 186.21, 70.09]
+    whole = stats.RunningStats(values)
+    merged = stats.RunningStats(values[:3])
+    merged.merge(stats.RunningStats(values[3:]))
+    merged.merge(stats.RunningStats())
+
+    assert merged.count == whole.count
+    assert merged.mean() == pytest.approx(whole.mean())
+    assert merged.stdev() == pytest.approx(statistics.stdev(values))
+    assert (merged.minimum, merged.maximum) == (70.09, 228.69)
+
+def test_column_stats_mean_is_exact(prepared):
+    comma = prepared()
+
+    assert comma.column_stats("age")["mean"] == comma.mean("age")
@@ -0,0 +1,84 @@
+"""
+This file contains tests for the row and columnar storage backends
+of class Comma.
+"""
+from ..pycomma.comma import Comma
+from ..pycomma.storage import ColumnStore
+import pytest
+import os
+
+def test_storage_invalid_argument(sample_path):
+    with pytest.raises(ValueError) as excinfo:
+        Comma(sample_path, storage="random")
+
+def test_columnar_matches_rows(prepared):
+    rows = prepared(storage="rows")
+    columnar = prepared(storage="columnar")
+
+    assert columnar.get_storage() == "columnar"
+    assert list(columnar.get_data()) == list(rows.get_data())
+    assert columnar.get(3) == rows.get(3)
+    assert columnar.get_row_values(-1) == rows.get_row_values(-1)
+    assert columnar.sum("age") == rows.sum("age")
+    assert columnar.mean("bmi", ignore_na=True) == \
+        rows.mean("bmi", ignore_na=True)
+
+def test_columnar_cells_round_trip():
+    store = ColumnStore.from_rows([["1", "2.50", "24"], ["2", "x", "36.6"]], 3)
+    assert store.column_kind(0) == "int"
+    assert store.column_kind(1) == "str"
+    assert store.column_kind(2) == "float"
+    assert store.column(2) == ["24", "36.6"]
+
+def test_columnar_mutations_demote_column_type(prepared):
+    comma = prepared(storage="columnar")
+    comma.append("age", " years")
+    assert comma.get(0, ["age"]) == {"age": "67 years"}
+
+    comma.add_row([str(i) for i in range(12)])
+    assert comma.dimension()["rows"] == 21
+    comma.delete_column("gender")
+    assert comma.get_row_values(-1) == [str(i) for i in range(12) if i != 1]
+
+def test_columnar_save_as_csv(tmp_path, sample_path, prepared):
+    output_path = os.path.join(str(tmp_path), "out.csv")
+    prepared(storage="columnar").save_as_csv(output_path)
+
+    with open(sample_path) as source, open(output_path) as output:
+        assert source.read() == output.read()
+
+def test_columnar_iterates_in_blocks():
+    rows = [[str(i), "x" + str(i % 3), str(i / 4)] for i in range(10_000)]
+    store = ColumnStore.from_rows(rows, 3)
+    iterator = iter(store)
+
+    assert next(iterator) == rows[0]
+    assert list(iterator) == rows[1:]
+    assert list(ColumnStore.from_rows([[], []], 0)) == [[], []]
+
+def test_columnar_numbers_are_floats(prepared):
+    rows = prepared(storage="rows")
+    columnar = prepared(storage="columnar")
+
+    for comma in (rows, columnar):
+        assert isinstance(comma.sum("age"), float)
+        assert isinstance(comma.minimum("age"), float)
+        assert isinstance(comma.column_stats("age")["sum"], float)
+    assert columnar.column_stats("age") == rows.column_stats("age")
+
+@pytest.mark.parametrize("engine", ["fast", "csv"])
+def test_blank_lines_are_skipped_by_both_backends(tmp_path, prepared, engine):
+    path = str(tmp_path / "blank.csv")
+    with open(path, mode="w", encoding="utf-8") as csv_file:
+        csv_file.write("a,b\n1,2\n\n3,4\n\n")
+
+    for storage in ("rows", "columnar"):
+        comma = prepared(path, storage=storage, engine=engine)
+        assert list(comma.get_data()) == [["1", "2"], ["3", "4"]]
+
+def test_columnar_short_row_error_names_the_row():
+    store = ColumnStore.from_rows([["1", "2"]], 2)
+
+    with pytest.raises(ValueError) as excinfo:
+        store.extend([["3", "4"], ["5"]])
+    assert "Row 2 has 1 values" in str(excinfo.value)
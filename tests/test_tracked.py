@@ -0,0 +1,108 @@
+"""
+This file contains tests for the tracked stats of class Comma.
+"""
+from ..pycomma import stats
+import pytest
+import statistics
+
+def untracked_results(comma, column_name, prepared):
+    copy = prepared()
+    copy.delete_rows(list(range(len(copy.get_data()))))
+    for row in comma.get_data():
+        copy.add_row(list(row))
+
+    return (
+        copy.sum(column_name, ignore_na=True),
+        copy.mean(column_name, ignore_na=True),
+        copy.stdev(column_name, ignore_na=True),
+        copy.median(column_name, ignore_na=True),
+        copy.minimum(column_name),
+        copy.maximum(column_name)
+    )
+
+def tracked_results(comma, column_name):
+    return (
+        comma.sum(column_name, ignore_na=True),
+        comma.mean(column_name, ignore_na=True),
+        comma.stdev(column_name, ignore_na=True),
+        comma.median(column_name, ignore_na=True),
+        comma.minimum(column_name),
+        comma.maximum(column_name)
+    )
+
+def test_tracked_stats_add_and_remove():
+    tracked = stats.TrackedStats(["1", "2", "N/A", "4"])
+    tracked.add("10")
+    tracked.remove("2")
+    tracked.remove("N/A")
+
+    assert tracked.count == 3
+    assert tracked.na_count == 0
+    assert tracked.total == 15
+    assert tracked.mean() == pytest.approx(5)
+    assert tracked.stdev() == pytest.approx(statistics.stdev([1, 4, 10]))
+    assert tracked.median() == 4
+    assert tracked.minimum() == 1
+    assert tracked.maximum() == 10
+
+@pytest.mark.parametrize("storage", ["rows", "columnar"])
+def test_tracked_stats_follow_row_mutations(storage, prepared):
+    comma = prepared(storage=storage)
+    comma.track_stats("age")
+    assert comma.get_tracked_stats() == ["age"]
+
+    row = list(comma.get_row_values(0))
+    row[comma.get_header().index("age")] = "100"
+    comma.add_row(row)
+    comma.delete_row(3)
+    comma.delete_rows([0, 5])
+    comma.change("age", "67", "1")
+    comma.sort_by_column("avg_glucose_level")
+
+    expected = untracked_results(comma, "age", prepared)
+    for result, value in zip(tracked_results(comma, "age"), expected):
+        assert result == pytest.approx(value)
+
+def test_tracked_stats_rebuilt_after_other_mutations(prepared):
+    comma = prepared()
+    comma.track_stats("age")
+    comma.append("age", "0")
+
+    assert comma.maximum("age") == 810
+    expected = untracked_results(comma, "age", prepared)
+    assert comma.sum("age") == pytest.approx(expected[0])
+
+def test_tracked_stats_keep_na_errors(prepared):
+    comma = prepared()
+    comma.track_stats("bmi")
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.mean("bmi")
+    assert "Value at row 1" in str(excinfo.value)
+
+    comma.delete_rows([1, 8, 13, 19])
+    assert comma.mean("bmi") == pytest.approx(
+        comma.mean("bmi", ignore_na=True)
+    )
+
+def test_untrack_stats(prepared):
+    comma = prepared()
+    comma.track_stats("age")
+    comma.change_column_name("age", "years")
+    assert comma.get_tracked_stats() == ["years"]
+
+    comma.untrack_stats("years")
+    assert comma.get_tracked_stats() == []
+
+    with pytest.raises(ValueError) as excinfo:
+        comma.untrack_stats("years")
+
+def test_tracked_mean_matches_untracked(prepared):
+    comma = prepared()
+    comma.track_stats("age")
+
+    comma.add_row(list(comma.get_row_values(0)))
+    comma.delete_row(3)
+    comma.change("age", "67", "1")
+
+    assert comma.mean("age") == untracked_results(comma, "age", prepared)[1]